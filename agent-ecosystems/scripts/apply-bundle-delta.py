@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Rebuild a bundle ZIP from a previous version plus a delta archive.
+
+Usage:
+  python3 agent-ecosystems/scripts/apply-bundle-delta.py --base <old.zip> --delta <x.delta.zip> [--out <new.zip>]
+
+The rebuilt archive is verified member-by-member and against the target
+sha256 recorded in the delta before it is moved into place.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+import zipfile
+from pathlib import Path
+
+from bundle_delta import DeltaError, apply_delta, read_delta_manifest
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Apply a bundle delta archive")
+    parser.add_argument("--base", type=Path, required=True, help="Previous bundle ZIP")
+    parser.add_argument("--delta", type=Path, required=True, help="Delta ZIP to apply")
+    parser.add_argument(
+        "--out",
+        type=Path,
+        help="Output path (default: target filename next to the base ZIP)",
+    )
+    args = parser.parse_args()
+
+    try:
+        manifest = read_delta_manifest(args.delta)
+        out_path = args.out or args.base.parent / manifest["target"]["filename"]
+        apply_delta(args.base, args.delta, out_path)
+    except (DeltaError, OSError, zipfile.BadZipFile) as exc:
+        sys.stderr.write(f"[bundle-delta] Error: {exc}\n")
+        return 1
+
+    print(
+        f"Rebuilt {out_path} (+{len(manifest['added'])} ~{len(manifest['changed'])} "
+        f"-{len(manifest['removed'])}), sha256 {manifest['target']['sha256']} verified"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
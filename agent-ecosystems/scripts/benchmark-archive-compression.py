@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""Benchmark ZIP creation: zipfile.ZipFile vs. bundle_archive with N threads.
+
+Usage:
+  python3 agent-ecosystems/scripts/benchmark-archive-compression.py [--source DIR] [--threads 1 2 4 8] [--methods deflate-1 lzma auto]
+
+Without --source a synthetic tree (mixed text-like and random data) is
+generated in a temporary directory. Each variant writes the same members in
+the same order; the script checks that every archive has identical member
+contents and prints the best-of-N wall time, speedup over zipfile and
+archive size for every (compression method, thread count) pair.
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import time
+import zipfile
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from bundle_archive import (
+    ZipStreamWriter,
+    compress_file,
+    imap_ordered,
+    validate_method,
+)
+
+
+def make_corpus(root: Path, files: int, size_kib: int, seed: int = 0) -> None:
+    rng = random.Random(seed)
+    words = [f"token{i}".encode("ascii") for i in range(512)]
+    for i in range(files):
+        path = root / f"dir{i % 8}" / f"file{i:04d}.txt"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = size_kib * 1024
+        if i % 4 == 3:
+            payload = rng.randbytes(size)
+        else:
+            chunks: List[bytes] = []
+            total = 0
+            while total < size:
+                chunk = b" ".join(rng.choices(words, k=32)) + b"\n"
+                chunks.append(chunk)
+                total += len(chunk)
+            payload = b"".join(chunks)[:size]
+        path.write_bytes(payload)
+
+
+def list_files(source: Path) -> List[Path]:
+    return sorted(p for p in source.rglob("*") if p.is_file())
+
+
+def zip_with_zipfile(paths: List[Path], base: Path, out: Path) -> None:
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        for path in paths:
+            zf.write(path, arcname=path.relative_to(base).as_posix())
+
+
+def zip_with_stream_writer(
+    paths: List[Path], base: Path, out: Path, threads: int, method: str = "deflate"
+) -> None:
+    def compress(path: Path):
+        return path.relative_to(base).as_posix(), compress_file(path, method)
+
+    with out.open("wb") as fp, ZipStreamWriter(fp) as zf:
+        for arcname, member in imap_ordered(compress, paths, threads):
+            zf.add(arcname, member)
+
+
+def member_digests(zip_path: Path) -> Dict[str, str]:
+    with zipfile.ZipFile(zip_path) as zf:
+        return {
+            name: hashlib.sha256(zf.read(name)).hexdigest() for name in zf.namelist()
+        }
+
+
+def best_of(repeat: int, func: Callable[[], None]) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--source", type=Path, help="Directory to archive")
+    parser.add_argument("--files", type=int, default=64, help="Synthetic file count")
+    parser.add_argument(
+        "--size-kib", type=int, default=512, help="Synthetic file size in KiB"
+    )
+    parser.add_argument(
+        "--threads",
+        type=int,
+        nargs="+",
+        default=[1, 2, 4, os.cpu_count() or 1],
+        help="Thread counts to benchmark (default: 1 2 4 <cpus>)",
+    )
+    parser.add_argument(
+        "--methods",
+        nargs="+",
+        default=["deflate"],
+        help="Compression methods to benchmark (stored, deflate[-N], bzip2[-N], lzma, auto)",
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per variant")
+    args = parser.parse_args()
+    for method in args.methods:
+        try:
+            validate_method(method)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    with tempfile.TemporaryDirectory(prefix="zip-bench-") as tmp:
+        tmp_dir = Path(tmp)
+        source = args.source
+        if source is None:
+            source = tmp_dir / "corpus"
+            make_corpus(source, args.files, args.size_kib)
+        if not source.is_dir():
+            sys.stderr.write(f"[zip-bench] Error: not a directory: {source}\n")
+            return 1
+        paths = list_files(source)
+        total = sum(p.stat().st_size for p in paths)
+        print(f"Archiving {len(paths)} files, {total / 1024 / 1024:.1f} MiB")
+
+        baseline_zip = tmp_dir / "zipfile.zip"
+        baseline = best_of(
+            args.repeat, lambda: zip_with_zipfile(paths, source, baseline_zip)
+        )
+        expected = member_digests(baseline_zip)
+        rows = [("zipfile.ZipFile", baseline, baseline_zip.stat().st_size)]
+        for method in args.methods:
+            for threads in sorted(set(args.threads)):
+                out = tmp_dir / f"stream-{method}-{threads}.zip"
+                seconds = best_of(
+                    args.repeat,
+                    partial(zip_with_stream_writer, paths, source, out, threads, method),
+                )
+                if member_digests(out) != expected:
+                    sys.stderr.write(f"[zip-bench] Error: {out.name} contents differ\n")
+                    return 1
+                rows.append((f"{method} x{threads}", seconds, out.stat().st_size))
+
+    print(f"{'VARIANT':<22} {'BEST ms':>10} {'SPEEDUP':>8} {'ZIP BYTES':>12}")
+    for name, seconds, size in rows:
+        print(f"{name:<22} {seconds * 1000:10.1f} {baseline / seconds:7.2f}x {size:12d}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
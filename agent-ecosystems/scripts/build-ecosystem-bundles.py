@@ -3,81 +3,347 @@
 
 - Discovers bundle JSON files.
 - Validates bundles and referenced artefacts.
-- Runs ecosystem + scenario validation as a preflight.
+- Runs ecosystem + scenario validation in-process as a preflight.
 - Produces ZIPs under dist/bundles and metadata under dist/metadata.
+- Streams artefacts directly into each ZIP (no staging copy), compressing
+  files shared by several bundles (e.g. OS variants of a stack) only once.
+- Skips bundles whose inputs are unchanged since the last build (--force to rebuild).
+- Optionally builds bundles concurrently (--jobs N) and compresses the
+  members of each bundle on several threads (--compress-threads N).
+- Compresses per a bundle's `compression` policy or --compression (stored,
+  deflate-N, bzip2, lzma, or auto), recording the choices in the manifest.
+- Optionally produces byte-identical ZIPs for identical inputs (--reproducible).
+- Optionally emits delta archives against previous versions (--delta-from).
+- Optionally watches inputs and rebuilds only the affected bundles (--watch).
+- Records per-phase/per-bundle timings in dist/metadata/build-metrics.json
+  (--timings prints them).
 """
 from __future__ import annotations
 
 import argparse
 import hashlib
+import io
 import json
-import shutil
-import subprocess
+import os
+import re
 import sys
+import tempfile
+import threading
+import time
+import traceback
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import (
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+)
 
 from jsonschema import Draft202012Validator
 
+from bundle_archive import (
+    REGULAR_FILE_ATTR,
+    CompressedMember,
+    CompressionPolicy,
+    MemberCache,
+    ZipStreamWriter,
+    compress_with,
+    imap_ordered,
+    normalize_member,
+    source_date_time,
+    validate_method,
+)
+from bundle_delta import DeltaError, create_delta, load_base_manifest, member_manifest
+from bundle_watch import PollingWatcher, ReverseIndex
+from ecosystem_validation import EcosystemData, validate_configs, validate_scenarios
+from schema_registry import get_registry, schema_errors
+
 ROOT = Path(__file__).resolve().parents[2]
 ECOSYSTEM_ROOT = ROOT / "agent-ecosystems"
 SCHEMA_DIR = ECOSYSTEM_ROOT / "schemas"
 BUNDLE_SCHEMA_PATH = SCHEMA_DIR / "bundle.schema.json"
 BUNDLES_DIR = ECOSYSTEM_ROOT / "bundles"
-STACKS_DIR = ECOSYSTEM_ROOT / "stacks"
 DIST_DIR = ROOT / "dist"
 DIST_BUNDLES = DIST_DIR / "bundles"
 DIST_METADATA = DIST_DIR / "metadata"
-TEMP_ROOT = DIST_DIR / "tmp"
+DIST_DELTAS = DIST_BUNDLES / "deltas"
+BUILD_CACHE_PATH = DIST_DIR / "cache" / "bundle-build-cache.json"
+BUILD_METRICS_PATH = DIST_METADATA / "build-metrics.json"
+METADATA_LOCK_PATH = DIST_DIR / "cache" / "metadata.lock"
+# Bump when the archive layout changes so stale cache entries are rebuilt.
+BUILD_CACHE_FORMAT = 5
+# Read size for hashing files that were not hashed while being written.
+HASH_CHUNK_SIZE = 1024 * 1024
+# <bundle-id>-v<version>-<os>.zip and its <...>-manifest.json member manifest
+ARTIFACT_NAME_RE = re.compile(
+    r"^(?P<id>.+)-v(?P<version>[^-]+)-(?P<os>macos|windows|linux)(?:\.zip|-manifest\.json)$"
+)
+
+
+class BuildResult(NamedTuple):
+    bundle_id: str
+    version: str
+    os_name: str
+    stack_id: Optional[str]
+    zip_path: Path
+    sha256: str
+    agents: List[str]
+    toolsets: List[str]
+    # Extra archive digests requested with --digest, e.g. {"blake2b": "..."}
+    digests: Optional[Dict[str, str]] = None
 
 
 class BundleError(Exception):
     pass
 
 
-def run_preflight() -> None:
-    cmds = [
-        ["python3", str(ECOSYSTEM_ROOT / "scripts" / "validate-ecosystem-configs.py")],
-        [
-            "python3",
-            str(ECOSYSTEM_ROOT / "scripts" / "run-agent-scenarios.py"),
-            "--no-output",
-        ],
+class HashingWriter(io.RawIOBase):
+    """Write-only, non-seekable sink that digests bytes as they pass through.
+
+    ZipStreamWriter never seeks back to patch headers, so the bytes hashed
+    here are exactly the bytes that land on disk.
+    """
+
+    def __init__(self, raw: io.BufferedIOBase, algorithms: Iterable[str]):
+        super().__init__()
+        self._raw = raw
+        self._hashes = {algo: hashlib.new(algo) for algo in algorithms}
+        self._pos = 0
+        self.hash_seconds = 0.0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        view = memoryview(data)
+        start = time.perf_counter()
+        for h in self._hashes.values():
+            h.update(view)
+        self.hash_seconds += time.perf_counter() - start
+        written = self._raw.write(view)
+        self._pos += len(view)
+        return written if written is not None else len(view)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        self._raw.flush()
+
+    def hexdigests(self) -> Dict[str, str]:
+        return {algo: h.hexdigest() for algo, h in self._hashes.items()}
+
+
+@contextmanager
+def timed(phases: Dict[str, float], name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases[name] = phases.get(name, 0.0) + time.perf_counter() - start
+
+
+def peak_rss_kib() -> int | None:
+    """Peak resident set size of this process so far (None where unsupported)."""
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is bytes on macOS and KiB on Linux.
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+@dataclass
+class BundleMetrics:
+    """Timings and I/O for one bundle; owned by the worker building it."""
+
+    bundle: str
+    wall_seconds: float = 0.0
+    phases: Dict[str, float] = field(default_factory=dict)
+    bytes_read: int = 0
+    bytes_written: int = 0
+    # Process-wide high-water mark when the bundle finished (shared by workers).
+    peak_rss_kib: int | None = None
+    cached: bool = False
+
+    def phase(self, name: str):
+        return timed(self.phases, name)
+
+    def add_read(self, nbytes: int) -> None:
+        self.bytes_read += nbytes
+
+
+@dataclass
+class BuildMetrics:
+    phases: Dict[str, float] = field(default_factory=dict)
+    bundles: List[BundleMetrics] = field(default_factory=list)
+
+    def phase(self, name: str):
+        return timed(self.phases, name)
+
+    def write(self, path: Path) -> None:
+        bundles = []
+        for b in self.bundles:
+            entry = asdict(b)
+            entry["wall_seconds"] = round(b.wall_seconds, 6)
+            entry["phases"] = {k: round(v, 6) for k, v in b.phases.items()}
+            bundles.append(entry)
+        payload = {
+            "phases": {k: round(v, 6) for k, v in self.phases.items()},
+            "peak_rss_kib": peak_rss_kib(),
+            "bundles": bundles,
+        }
+        atomic_write_text(path, json.dumps(payload, indent=2))
+
+    def print_table(self) -> None:
+        columns = ["schema_validation", "resolve", "compress", "archive", "hash"]
+        print("Build phases:")
+        for name, seconds in self.phases.items():
+            print(f"  {name:<12} {seconds * 1000:10.1f} ms")
+        header = ["BUNDLE", "WALL ms", *(f"{c} ms" for c in columns)]
+        header += ["READ B", "WRITTEN B", "PEAK RSS KiB"]
+        rows = [header]
+        for b in self.bundles:
+            rows.append(
+                [
+                    b.bundle + (" (cached)" if b.cached else ""),
+                    f"{b.wall_seconds * 1000:.1f}",
+                    *(f"{b.phases.get(c, 0.0) * 1000:.1f}" for c in columns),
+                    str(b.bytes_read),
+                    str(b.bytes_written),
+                    "-" if b.peak_rss_kib is None else str(b.peak_rss_kib),
+                ]
+            )
+        widths = [max(len(row[i]) for row in rows) for i in range(len(header))]
+        for row in rows:
+            print(" | ".join(cell.ljust(w) for cell, w in zip(row, widths, strict=True)))
+
+
+@dataclass
+class BuildCache:
+    """Persistent map of ZIP filename -> input digest and archive digests."""
+
+    path: Path
+    entries: Dict[str, dict] = field(default_factory=dict)
+    hits: Set[str] = field(default_factory=set)
+    # Re-hash every reused ZIP, not only those whose mtime changed.
+    verify: bool = False
+    _stored: Set[str] = field(default_factory=set, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @classmethod
+    def load(cls, path: Path, verify: bool = False) -> "BuildCache":
+        entries: Dict[str, dict] = {}
+        if path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                data = {}
+            if data.get("format") == BUILD_CACHE_FORMAT:
+                entries = data.get("bundles", {})
+        return cls(path=path, entries=entries, verify=verify)
+
+    def lookup(
+        self, zip_path: Path, key: str, algorithms: Iterable[str]
+    ) -> Dict[str, str] | None:
+        """Return cached digests if the inputs and the ZIP on disk are unchanged.
+
+        The ZIP must still have the recorded size. A matching mtime is
+        trusted as is (archives are only ever replaced atomically); otherwise,
+        or always with `verify`, the ZIP is re-hashed and reused only if its
+        sha256 matches, so a corrupted or edited archive is rebuilt.
+        """
+        with self._lock:
+            entry = self.entries.get(zip_path.name)
+        if not entry or entry.get("key") != key:
+            return None
+        digests = entry.get("digests", {})
+        if any(algo not in digests for algo in algorithms):
+            return None
+        try:
+            stat = zip_path.stat()
+        except FileNotFoundError:
+            return None
+        if stat.st_size != entry.get("size"):
+            return None
+        touched = stat.st_mtime_ns != entry.get("mtime_ns")
+        if (touched or self.verify) and sha256_file(zip_path) != digests.get("sha256"):
+            return None
+        with self._lock:
+            self.hits.add(zip_path.name)
+            if touched:
+                # Same bytes, new mtime: remember it so the next run skips the hash.
+                self.entries[zip_path.name] = {**entry, "mtime_ns": stat.st_mtime_ns}
+                self._stored.add(zip_path.name)
+        return dict(digests)
+
+    def store(self, zip_path: Path, key: str, digests: Dict[str, str]) -> None:
+        stat = zip_path.stat()
+        with self._lock:
+            self.entries[zip_path.name] = {
+                "key": key,
+                "digests": dict(digests),
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+            }
+            self._stored.add(zip_path.name)
+
+    def save(self) -> None:
+        """Merge this run's entries into the cache file (safe across processes)."""
+        with metadata_lock(self.path.with_suffix(".lock")):
+            entries = BuildCache.load(self.path).entries
+            entries.update((name, self.entries[name]) for name in self._stored)
+            payload = {"format": BUILD_CACHE_FORMAT, "bundles": entries}
+            atomic_write_text(self.path, json.dumps(payload, indent=2, sort_keys=True))
+
+
+def run_preflight(data: EcosystemData) -> None:
+    """Run config + scenario validation in-process against the loaded ecosystem."""
+    checks = [
+        ("ecosystem config validation", validate_configs(data).errors),
+        ("scenario validation", validate_scenarios(data).errors),
     ]
-    for cmd in cmds:
-        result = subprocess.run(cmd, cwd=ROOT, capture_output=True, text=True)
-        if result.returncode != 0:
-            sys.stderr.write(result.stdout)
-            sys.stderr.write(result.stderr)
-            raise BundleError(f"Preflight command failed: {' '.join(cmd)}")
+    for name, errors in checks:
+        if errors:
+            for err in errors:
+                sys.stderr.write(f"- {err}\n")
+            raise BundleError(f"Preflight {name} failed ({len(errors)} error(s))")
 
 
-def load_schema(path: Path) -> dict:
-    if not path.exists():
-        raise BundleError(f"Missing schema: {path}")
-    return json.loads(path.read_text(encoding="utf-8"))
+def load_ecosystem() -> EcosystemData:
+    """Load agents/toolsets/stacks/contracts, reporting bad files as BundleError."""
+    try:
+        return EcosystemData.load()
+    except (json.JSONDecodeError, OSError) as exc:
+        raise BundleError(f"Cannot load ecosystem config: {exc}") from exc
 
 
-def load_json(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
+def load_bundle_validator() -> Draft202012Validator:
+    """Compiled bundle.schema.json validator from the shared schema registry."""
+    try:
+        return get_registry().validator(BUNDLE_SCHEMA_PATH.name)
+    except FileNotFoundError as exc:
+        raise BundleError(f"Missing schema: {BUNDLE_SCHEMA_PATH}") from exc
 
 
-def load_stacks() -> Dict[str, dict]:
-    stacks: Dict[str, dict] = {}
-    for stack_path in STACKS_DIR.glob("*.json"):
-        data = load_json(stack_path)
-        stacks[data["id"]] = data
-    return stacks
+def load_json(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
 
 
-def validate_bundle(bundle: dict, schema: dict, path: Path) -> List[str]:
-    errors: List[str] = []
-    validator = Draft202012Validator(schema)
-    for err in validator.iter_errors(bundle):
-        location = "/".join(str(p) for p in err.path) or "<root>"
-        errors.append(f"{path}: {location}: {err.message}")
-    return errors
+def validate_bundle(
+    bundle: dict, validator: Draft202012Validator, path: Path
+) -> List[str]:
+    return schema_errors(validator, bundle, path)
 
 
 def resolve_artifacts(bundle: dict) -> List[Tuple[str, Path]]:
@@ -94,46 +360,246 @@ def ensure_artifacts_exist(resolved: List[Tuple[str, Path]]) -> None:
         raise BundleError(f"Missing artefacts: {', '.join(missing)}")
 
 
-def copy_artifacts(resolved: List[Tuple[str, Path]], dest_root: Path) -> None:
+def iter_archive_members(resolved: List[Tuple[str, Path]]) -> Iterator[Tuple[str, Path]]:
+    """Yield (arcname, source) for every file, expanding directory artefacts."""
     for original, abs_path in resolved:
-        target = dest_root / original
-        target.parent.mkdir(parents=True, exist_ok=True)
         if abs_path.is_dir():
-            shutil.copytree(abs_path, target, dirs_exist_ok=True)
+            for child in sorted(abs_path.rglob("*")):
+                if child.is_file():
+                    rel = child.relative_to(abs_path).as_posix()
+                    yield f"{original.rstrip('/')}/{rel}", child
         else:
-            shutil.copy2(abs_path, target)
+            yield original, abs_path
 
 
-def write_manifest(bundle: dict, stack: dict | None, dest_root: Path) -> None:
+def bundle_cache_key(
+    bundle: dict,
+    stack: dict | None,
+    resolved: List[Tuple[str, Path]],
+    policy: CompressionPolicy | None = None,
+    reproducible: bool = False,
+) -> str:
+    """Digest every build input: bundle definition, stack, artefact contents
+    and the archive settings (compression policy, reproducible mode)."""
+    h = hashlib.sha256()
+    h.update(f"format={BUILD_CACHE_FORMAT}\n".encode("utf-8"))
+    if reproducible:
+        h.update(f"reproducible={source_date_time()}\n".encode("utf-8"))
+    h.update(json.dumps((policy or CompressionPolicy()).to_manifest()).encode("utf-8"))
+    h.update(json.dumps(bundle, sort_keys=True).encode("utf-8"))
+    h.update(json.dumps(stack, sort_keys=True).encode("utf-8"))
+    for arcname, source in iter_archive_members(resolved):
+        h.update(f"\n{arcname}\0{sha256_file(source)}".encode("utf-8"))
+    return h.hexdigest()
+
+
+def build_manifest(
+    bundle: dict, stack: dict | None, build_id: str | None = None
+) -> dict:
+    """Bundle metadata; with a build_id (reproducible builds) instead of built_at."""
     manifest = {
         "id": bundle["id"],
         "version": bundle["version"],
         "os": bundle["os"],
         "stackId": bundle.get("stackId"),
         "artifacts": bundle.get("artifacts", []),
-        "built_at": datetime.now(timezone.utc).isoformat(),
     }
+    if build_id:
+        manifest["buildId"] = build_id
+    else:
+        manifest["built_at"] = datetime.now(timezone.utc).isoformat()
     if stack:
         manifest["defaultAgents"] = stack.get("defaultAgents", [])
         manifest["defaultToolsets"] = stack.get("defaultToolsets", [])
-    (dest_root / "BUNDLE_MANIFEST.json").write_text(
-        json.dumps(manifest, indent=2), encoding="utf-8"
+    return manifest
+
+
+def shared_sources(bundles: Iterable[dict]) -> Set[Path]:
+    """Return artefact files referenced by more than one bundle.
+
+    OS variants of a stack ship the same profile, stack, agents and toolsets;
+    only these files are worth keeping compressed in memory between builds.
+    """
+    seen: Set[Path] = set()
+    shared: Set[Path] = set()
+    for bundle in bundles:
+        resolved = resolve_artifacts(bundle)
+        sources = {src for _, src in iter_archive_members(resolved) if src.exists()}
+        shared |= seen & sources
+        seen |= sources
+    return shared
+
+
+def write_archive(
+    zip_path: Path,
+    resolved: List[Tuple[str, Path]],
+    manifest: dict,
+    algorithms: Iterable[str] = ("sha256",),
+    members: MemberCache | None = None,
+    metrics: BundleMetrics | None = None,
+    member_log: List[dict] | None = None,
+    compress_threads: int = 1,
+    policy: CompressionPolicy | None = None,
+    reproducible: bool = False,
+) -> Dict[str, str]:
+    """Stream artefacts into the bundle ZIP, returning digests of the archive.
+
+    Members come from `members`, so files shared with other bundles are
+    compressed once and their deflated bytes are copied into each archive.
+    With compress_threads > 1 members are deflated concurrently but still
+    appended in artefact order. `policy` picks each member's compression
+    method; the choices are recorded in BUNDLE_MANIFEST.json. With
+    `reproducible`, members are sorted by name and carry normalised
+    timestamps/modes, so identical inputs give a byte-identical ZIP. If
+    given, `member_log` receives a manifest entry per member.
+    """
+    members = members or MemberCache(shared=set())
+    metrics = metrics or BundleMetrics(bundle=zip_path.name)
+    start = time.perf_counter()
+    compress_before = metrics.phases.get("compress", 0.0)
+    # A unique sibling temp file, so concurrent builds (threads or separate
+    # processes with overlapping filters) never write to the same file.
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{zip_path.name}.", suffix=".tmp", dir=zip_path.parent
     )
+    tmp_zip = Path(tmp_name)
+    policy = policy or CompressionPolicy()
+    chosen: Dict[str, dict] = {}
+    date_time = source_date_time() if reproducible else None
+    sources: Iterable[Tuple[str, Path]] = iter_archive_members(resolved)
+    if reproducible:
+        sources = sorted(sources)
+
+    def compress_member(item: Tuple[str, Path]) -> Tuple[str, CompressedMember, int]:
+        # Runs on a worker thread, so bytes read are reported back to the
+        # caller instead of touching metrics here.
+        arcname, source = item
+        reads: List[int] = []
+        member = members.get(source, policy.method_for(arcname), reads.append)
+        if date_time:
+            member = normalize_member(member, date_time)
+        return arcname, member, sum(reads)
+
+    try:
+        with os.fdopen(fd, "wb") as raw:
+            # mkstemp creates 0600; published bundles keep the usual mode.
+            os.fchmod(raw.fileno(), 0o644)
+            sink = HashingWriter(raw, algorithms)
+            with ZipStreamWriter(sink) as zf:
+                compressed = imap_ordered(compress_member, sources, compress_threads)
+                while True:
+                    # Time spent waiting on compression, which with threads
+                    # overlaps writing the previous members.
+                    with metrics.phase("compress"):
+                        item = next(compressed, None)
+                    if item is None:
+                        break
+                    arcname, member, nread = item
+                    metrics.add_read(nread)
+                    zf.add(arcname, member)
+                    chosen[arcname] = compression_record(
+                        member, timings=not reproducible
+                    )
+                manifest = {
+                    **manifest,
+                    "compression": {
+                        "policy": policy.to_manifest(),
+                        "members": chosen,
+                    },
+                }
+                with metrics.phase("compress"):
+                    manifest_member = compress_with(
+                        json.dumps(manifest, indent=2).encode("utf-8"),
+                        policy.method_for("BUNDLE_MANIFEST.json"),
+                        external_attr=REGULAR_FILE_ATTR,
+                    )
+                    if date_time:
+                        manifest_member = normalize_member(manifest_member, date_time)
+                zf.add("BUNDLE_MANIFEST.json", manifest_member)
+            if member_log is not None:
+                member_log.extend(zf.entries)
+        tmp_zip.replace(zip_path)
+    finally:
+        tmp_zip.unlink(missing_ok=True)
+    # Whatever was not compressing or hashing was spent writing the archive.
+    compress = metrics.phases.get("compress", 0.0) - compress_before
+    elapsed = time.perf_counter() - start
+    metrics.phases["hash"] = metrics.phases.get("hash", 0.0) + sink.hash_seconds
+    metrics.phases["archive"] = metrics.phases.get("archive", 0.0) + max(
+        0.0, elapsed - compress - sink.hash_seconds
+    )
+    metrics.bytes_written += sink.tell()
+    return sink.hexdigests()
+
+
+def compression_record(member: CompressedMember, timings: bool = True) -> dict:
+    """How a member was compressed, including what "auto" weighed up.
+
+    Candidate timings vary run to run, so reproducible builds omit them.
+    """
+    record = {
+        "method": member.method,
+        "size": member.file_size,
+        "compressedSize": len(member.data),
+    }
+    if member.trials:
+        record["candidates"] = {
+            spec: (
+                {"compressedSize": size, "ms": round(seconds * 1000, 3)}
+                if timings
+                else {"compressedSize": size}
+            )
+            for spec, size, seconds in member.trials
+        }
+    return record
+
+
+def hash_file(path: Path, algorithms: Iterable[str] = ("sha256",)) -> Dict[str, str]:
+    """Digest a file in one pass using large reads into a reusable buffer."""
+    hashes = {algo: hashlib.new(algo) for algo in algorithms}
+    buf = bytearray(HASH_CHUNK_SIZE)
+    view = memoryview(buf)
+    with path.open("rb", buffering=0) as f:
+        while True:
+            n = f.readinto(buf)
+            if not n:
+                break
+            for h in hashes.values():
+                h.update(view[:n])
+    return {algo: h.hexdigest() for algo, h in hashes.items()}
 
 
 def sha256_file(path: Path) -> str:
-    h = hashlib.sha256()
-    with path.open("rb") as f:
-        for chunk in iter(lambda: f.read(8192), b""):
-            h.update(chunk)
-    return h.hexdigest()
+    return hash_file(path)["sha256"]
+
+
+def member_manifest_path(zip_path: Path) -> Path:
+    return DIST_METADATA / f"{zip_path.stem}-manifest.json"
+
+
+def write_member_manifest(zip_path: Path, sha: str, members: List[dict]) -> None:
+    """Record per-member digests so later releases can build deltas from it."""
+    payload = {"filename": zip_path.name, "sha256": sha, "members": members}
+    atomic_write_text(member_manifest_path(zip_path), json.dumps(payload, indent=2))
 
 
 def build_bundle(
-    bundle_path: Path, schema: dict, stacks: Dict[str, dict]
-) -> Tuple[str, str, str, str | None, Path, str, List[str], List[str]]:
-    bundle = load_json(bundle_path)
-    errors = validate_bundle(bundle, schema, bundle_path)
+    bundle_path: Path,
+    validator: Draft202012Validator,
+    stacks: Dict[str, dict],
+    cache: BuildCache | None = None,
+    force: bool = False,
+    extra_digests: Iterable[str] = (),
+    members: MemberCache | None = None,
+    metrics: BundleMetrics | None = None,
+    compress_threads: int = 1,
+    compression: str = "deflate",
+    reproducible: bool = False,
+) -> BuildResult:
+    metrics = metrics or BundleMetrics(bundle=bundle_path.name)
+    with metrics.phase("schema_validation"):
+        bundle = load_json(bundle_path)
+        errors = validate_bundle(bundle, validator, bundle_path)
     if errors:
         raise BundleError("; ".join(errors))
 
@@ -143,67 +609,400 @@ def build_bundle(
     if os_name not in {"macos", "windows", "linux"}:
         raise BundleError(f"Invalid os '{os_name}' in {bundle_path}")
 
-    resolved = resolve_artifacts(bundle)
-    ensure_artifacts_exist(resolved)
+    with metrics.phase("resolve"):
+        resolved = resolve_artifacts(bundle)
+        ensure_artifacts_exist(resolved)
 
     stack_id = bundle.get("stackId")
     stack = stacks.get(stack_id)
-
-    temp_dir = TEMP_ROOT / f"{bundle_id}-v{version}-{os_name}"
-    if temp_dir.exists():
-        shutil.rmtree(temp_dir)
-    temp_dir.mkdir(parents=True, exist_ok=True)
-
-    copy_artifacts(resolved, temp_dir)
-    write_manifest(bundle, stack, temp_dir)
+    try:
+        policy = CompressionPolicy.from_config(bundle.get("compression"), compression)
+    except ValueError as exc:
+        raise BundleError(f"{bundle_path}: {exc}") from exc
 
     zip_name = f"{bundle_id}-v{version}-{os_name}.zip"
     zip_path = DIST_BUNDLES / zip_name
     zip_path.parent.mkdir(parents=True, exist_ok=True)
 
-    shutil.make_archive(zip_path.with_suffix(""), "zip", temp_dir)
-    shutil.rmtree(temp_dir, ignore_errors=True)
+    algorithms = ["sha256", *(a for a in extra_digests if a != "sha256")]
+    cache_key = None
+    if cache or reproducible:
+        # Doubles as the reproducible build identity: a digest of the inputs.
+        with metrics.phase("resolve"):
+            cache_key = bundle_cache_key(bundle, stack, resolved, policy, reproducible)
+        metrics.add_read(
+            sum(src.stat().st_size for _, src in iter_archive_members(resolved))
+        )
+    digests = None
+    if cache and not force:
+        digests = cache.lookup(zip_path, cache_key, algorithms)
+        metrics.cached = digests is not None
+    if digests is None:
+        member_log: List[dict] = []
+        digests = write_archive(
+            zip_path,
+            resolved,
+            build_manifest(bundle, stack, cache_key if reproducible else None),
+            algorithms,
+            members,
+            metrics,
+            member_log,
+            compress_threads,
+            policy,
+            reproducible,
+        )
+        write_member_manifest(zip_path, digests["sha256"], member_log)
+        if cache:
+            cache.store(zip_path, cache_key, digests)
+    elif not member_manifest_path(zip_path).exists():
+        manifest = member_manifest(zip_path)
+        write_member_manifest(zip_path, manifest["sha256"], manifest["members"])
 
-    hash_hex = sha256_file(zip_path)
     agents = stack.get("defaultAgents", []) if stack else []
     toolsets = stack.get("defaultToolsets", []) if stack else []
-    return bundle_id, version, os_name, stack_id, zip_path, hash_hex, agents, toolsets
+    return BuildResult(
+        bundle_id,
+        version,
+        os_name,
+        stack_id,
+        zip_path,
+        digests["sha256"],
+        agents,
+        toolsets,
+        {algo: digests[algo] for algo in algorithms[1:]},
+    )
+
+
+@contextmanager
+def metadata_lock(path: Path = METADATA_LOCK_PATH) -> Iterator[None]:
+    """Hold an exclusive advisory lock while reading/rewriting dist/metadata."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a+b") as handle:
+        try:
+            import fcntl
+        except ImportError:  # Windows
+            import msvcrt
+
+            handle.seek(0)
+            msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+            try:
+                yield
+            finally:
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            return
+        fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
+
+
+def atomic_write_text(path: Path, text: str) -> None:
+    """Write via a sibling temp file + os.replace so readers never see a partial file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def read_checksums(path: Path) -> Dict[str, str]:
+    """Parse a `<digest>  <filename>` file into {filename: digest}."""
+    entries: Dict[str, str] = {}
+    if not path.exists():
+        return entries
+    for line in path.read_text(encoding="utf-8").splitlines():
+        digest, sep, name = line.partition("  ")
+        if sep and name:
+            entries[name] = digest
+    return entries
 
 
 def write_checksums(
-    built: List[Tuple[str, str, str, str | None, Path, str, List[str], List[str]]],
+    built: List[BuildResult],
+    merge: bool = False,
 ) -> None:
-    by_version: Dict[str, List[Tuple[Path, str]]] = {}
-    for _, version, _, _, zip_path, sha, _, _ in built:
-        by_version.setdefault(version, []).append((zip_path, sha))
+    """Write checksum files; with merge=True, upsert into the existing files."""
+    # (version, algorithm) -> [(zip_path, digest)]; sha256 keeps the
+    # historical checksums-v<version>.txt name, extras get a suffix.
+    by_file: Dict[Tuple[str, str], List[Tuple[Path, str]]] = {}
+    for result in built:
+        digests = {"sha256": result.sha256, **(result.digests or {})}
+        for algo, digest in digests.items():
+            by_file.setdefault((result.version, algo), []).append(
+                (result.zip_path, digest)
+            )
 
-    for version, entries in by_version.items():
-        lines = [f"{sha}  {p.name}" for p, sha in entries]
-        out_path = DIST_METADATA / f"checksums-v{version}.txt"
-        out_path.parent.mkdir(parents=True, exist_ok=True)
-        out_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    for (version, algo), entries in by_file.items():
+        suffix = "" if algo == "sha256" else f".{algo}"
+        out_path = DIST_METADATA / f"checksums-v{version}{suffix}.txt"
+        if merge:
+            merged = read_checksums(out_path)
+            merged.update((p.name, digest) for p, digest in entries)
+            lines = [f"{digest}  {name}" for name, digest in sorted(merged.items())]
+        else:
+            lines = [f"{digest}  {p.name}" for p, digest in entries]
+        atomic_write_text(out_path, "\n".join(lines) + "\n")
 
 
 def write_index(
-    built: List[Tuple[str, str, str, str | None, Path, str, List[str], List[str]]],
+    built: List[BuildResult],
+    merge: bool = False,
 ) -> None:
+    """Write bundles-index.json; with merge=True, upsert by filename."""
     index_path = DIST_METADATA / "bundles-index.json"
     entries = []
-    for bundle_id, version, os_name, stack_id, zip_path, sha, agents, toolsets in built:
+    for result in built:
         entries.append(
             {
-                "id": bundle_id,
-                "version": version,
-                "os": os_name,
-                "stackId": stack_id,
-                "filename": zip_path.name,
-                "sha256": sha,
-                "agents": agents,
-                "toolsets": toolsets,
+                "id": result.bundle_id,
+                "version": result.version,
+                "os": result.os_name,
+                "stackId": result.stack_id,
+                "filename": result.zip_path.name,
+                "sha256": result.sha256,
+                **(result.digests or {}),
+                "agents": result.agents,
+                "toolsets": result.toolsets,
             }
         )
-    index_path.parent.mkdir(parents=True, exist_ok=True)
-    index_path.write_text(json.dumps(entries, indent=2), encoding="utf-8")
+    if merge and index_path.exists():
+        try:
+            existing = json.loads(index_path.read_text(encoding="utf-8"))
+        except ValueError as exc:
+            raise BundleError(f"Cannot merge into corrupt {index_path}: {exc}") from exc
+        by_name = {e.get("filename"): e for e in existing}
+        by_name.update((e["filename"], e) for e in entries)
+        entries = [by_name[name] for name in sorted(by_name)]
+    atomic_write_text(index_path, json.dumps(entries, indent=2))
+
+
+def build_bundles(
+    bundle_paths: List[Path],
+    validator: Draft202012Validator,
+    stacks: Dict[str, dict],
+    jobs: int,
+    cache: BuildCache | None = None,
+    force: bool = False,
+    extra_digests: Iterable[str] = (),
+    metrics: BuildMetrics | None = None,
+    compress_threads: int = 1,
+    compression: str = "deflate",
+    reproducible: bool = False,
+) -> List[Tuple[Path, BuildResult | None, BaseException | None]]:
+    """Build every bundle, returning (path, result, error) in input order."""
+    members = MemberCache(
+        shared=shared_sources(load_json(path) for path in bundle_paths)
+    )
+    per_bundle = [BundleMetrics(bundle=path.name) for path in bundle_paths]
+    if metrics is not None:
+        metrics.bundles.extend(per_bundle)
+
+    def attempt(
+        item: Tuple[Path, BundleMetrics]
+    ) -> Tuple[Path, BuildResult | None, BaseException | None]:
+        path, bundle_metrics = item
+        start = time.perf_counter()
+        try:
+            return path, build_bundle(
+                path,
+                validator,
+                stacks,
+                cache,
+                force,
+                extra_digests,
+                members,
+                bundle_metrics,
+                compress_threads,
+                compression,
+                reproducible,
+            ), None
+        except Exception as exc:  # pragma: no cover - build guardrail
+            return path, None, exc
+        finally:
+            bundle_metrics.wall_seconds = time.perf_counter() - start
+            bundle_metrics.peak_rss_kib = peak_rss_kib()
+
+    items = list(zip(bundle_paths, per_bundle, strict=True))
+    if jobs <= 1 or len(bundle_paths) <= 1:
+        return [attempt(item) for item in items]
+    # zlib and file I/O release the GIL, so threads overlap the heavy work
+    # without the pickling cost of shipping validators/stacks to subprocesses.
+    # Each build writes to its own mkstemp() temp file next to its ZIP, so
+    # builds never share files, within this process or across processes.
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        return list(pool.map(attempt, items))
+
+
+def find_delta_bases(paths: List[Path]) -> Dict[Tuple[str, str], List[Path]]:
+    """Index previous ZIPs/member manifests by (bundle id, os).
+
+    A ZIP and its -manifest.json describe the same base, so each
+    (id, os, version) is kept once, preferring the manifest (no ZIP read).
+    """
+    chosen: Dict[Tuple[str, str, str], Path] = {}
+    files: List[Path] = []
+    for path in paths:
+        if path.is_dir():
+            files.extend(sorted(path.iterdir()))
+        elif path.exists():
+            files.append(path)
+        else:
+            raise BundleError(f"--delta-from path not found: {path}")
+    for path in files:
+        match = ARTIFACT_NAME_RE.match(path.name)
+        if not match:
+            continue
+        key = (match["id"], match["os"], match["version"])
+        if key not in chosen or path.suffix == ".json":
+            chosen[key] = path
+    bases: Dict[Tuple[str, str], List[Path]] = {}
+    for (bundle_id, os_name, _), path in chosen.items():
+        bases.setdefault((bundle_id, os_name), []).append(path)
+    return bases
+
+
+def write_deltas(built: List[BuildResult], base_paths: List[Path]) -> int:
+    """Emit <id>-v<old>-to-v<new>-<os>.delta.zip for every bundle with a base."""
+    bases = find_delta_bases(base_paths)
+    written = 0
+    for result in built:
+        for base_path in bases.get((result.bundle_id, result.os_name), []):
+            try:
+                base = load_base_manifest(base_path)
+            except (DeltaError, OSError, ValueError, zipfile.BadZipFile) as exc:
+                raise BundleError(f"Cannot read delta base {base_path}: {exc}") from exc
+            if base.get("sha256") == result.sha256:
+                continue
+            old_version = ARTIFACT_NAME_RE.match(base_path.name)["version"]
+            out_path = DIST_DELTAS / (
+                f"{result.bundle_id}-v{old_version}-to-v{result.version}-{result.os_name}.delta.zip"
+            )
+            delta = create_delta(base, result.zip_path, out_path)
+            print(
+                f"Delta {base_path.name} -> {result.zip_path.name}: "
+                f"+{len(delta['added'])} ~{len(delta['changed'])} -{len(delta['removed'])} "
+                f"({out_path.stat().st_size} bytes) -> {out_path.name}"
+            )
+            written += 1
+    return written
+
+
+def bundle_inputs(
+    bundle_path: Path, bundle: dict, stack_files: Dict[str, Path]
+) -> List[Path]:
+    """Every file a bundle's ZIP depends on: its JSON, stack and artefacts."""
+    inputs = [bundle_path.resolve(), *(src for _, src in resolve_artifacts(bundle))]
+    stack_path = stack_files.get(bundle.get("stackId"))
+    if stack_path:
+        inputs.append(stack_path.resolve())
+    return inputs
+
+
+def build_reverse_index(bundle_paths: List[Path], data: EcosystemData) -> ReverseIndex:
+    stack_files = {
+        doc.get("id"): path for path, doc in data.documents.get("stacks", {}).items()
+    }
+    index = ReverseIndex()
+    for path in bundle_paths:
+        index.add(path.resolve(), bundle_inputs(path, load_json(path), stack_files))
+    return index
+
+
+def watch_bundles(
+    bundle_id: str | None,
+    os_filter: List[str],
+    validator: Draft202012Validator,
+    data: EcosystemData,
+    jobs: int,
+    cache: BuildCache,
+    extra_digests: Iterable[str],
+    interval: float,
+    debounce: float,
+    compress_threads: int = 1,
+    compression: str = "deflate",
+    reproducible: bool = False,
+) -> int:
+    """Rebuild only the bundles whose inputs change, until interrupted."""
+    bundle_paths = discover_bundles(bundle_id, os_filter)
+    index = build_reverse_index(bundle_paths, data)
+
+    def watched() -> Set[Path]:
+        return (
+            index.watched_files()
+            | {p.resolve() for p in BUNDLES_DIR.glob("*.bundle.json")}
+            | {BUNDLE_SCHEMA_PATH}
+        )
+
+    watcher = PollingWatcher(watched, interval=interval, debounce=debounce)
+    print(
+        f"Watching {len(index)} input(s) of {len(bundle_paths)} bundle(s); press Ctrl-C to stop"
+    )
+    try:
+        while True:
+            changed = watcher.wait()
+            start = time.perf_counter()
+            try:
+                # Schemas may have been edited too; recompiling them is cheap
+                # next to a build.
+                get_registry.cache_clear()
+                data = load_ecosystem()
+                run_preflight(data)
+                validator = load_bundle_validator()
+                bundle_paths = discover_bundles(bundle_id, os_filter)
+                affected = index.affected(changed) | changed
+                if BUNDLE_SCHEMA_PATH in changed:
+                    affected |= {p.resolve() for p in bundle_paths}
+                index = build_reverse_index(bundle_paths, data)
+            except (BundleError, OSError, ValueError) as exc:
+                sys.stderr.write(f"[bundle-builder] Error: {exc}\n")
+                continue
+            targets = [p for p in bundle_paths if p.resolve() in affected]
+            if not targets:
+                continue
+
+            results = build_bundles(
+                targets,
+                validator,
+                data.stacks,
+                jobs,
+                cache,
+                False,
+                extra_digests,
+                compress_threads=compress_threads,
+                compression=compression,
+                reproducible=reproducible,
+            )
+            cache.save()
+            built: List[BuildResult] = []
+            for path, result, exc in results:
+                if exc is not None:
+                    sys.stderr.write(f"Failed to build {path}: {exc}\n")
+                else:
+                    built.append(result)
+            if built:
+                with metadata_lock():
+                    write_checksums(built, merge=True)
+                    write_index(built, merge=True)
+            names = ", ".join(r.zip_path.name for r in built) or "nothing"
+            print(
+                f"Rebuilt {names} in {(time.perf_counter() - start) * 1000:.0f} ms "
+                f"({len(changed)} changed file(s), {len(results) - len(built)} failed)"
+            )
+    except KeyboardInterrupt:
+        return 0
+
+
+def compression_spec(value: str) -> str:
+    try:
+        return validate_method(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError(str(exc)) from exc
 
 
 def discover_bundles(bundle_id: str | None, os_filter: List[str]) -> List[Path]:
@@ -224,48 +1023,182 @@ def main() -> int:
     parser.add_argument(
         "--os", nargs="*", choices=["macos", "windows", "linux"], help="OS filter"
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of bundles to build concurrently (default: 1)",
+    )
+    parser.add_argument(
+        "--compress-threads",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Threads compressing the members of each bundle (default: 1)",
+    )
+    parser.add_argument(
+        "--compression",
+        default="deflate",
+        type=compression_spec,
+        metavar="METHOD",
+        help="Default compression for bundles without their own `compression` policy: "
+        "stored, deflate[-1..9], bzip2[-1..9], lzma or auto (default: deflate)",
+    )
+    parser.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Byte-identical ZIPs for identical inputs: sorted members, SOURCE_DATE_EPOCH "
+        "(or 1980-01-01) timestamps, 0644/0755 modes and an input-derived buildId",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Rebuild every bundle, ignoring the incremental build cache",
+    )
+    parser.add_argument(
+        "--verify-cache",
+        action="store_true",
+        help="Re-hash every cached ZIP before reusing it (default: only when its mtime changed)",
+    )
+    parser.add_argument(
+        "--digest",
+        action="append",
+        default=[],
+        choices=sorted(
+            a for a in hashlib.algorithms_guaranteed if not a.startswith("shake_")
+        ),
+        metavar="ALGO",
+        help="Extra archive digest to record alongside sha256 (repeatable, e.g. blake2b)",
+    )
+    parser.add_argument(
+        "--timings",
+        action="store_true",
+        help="Print per-phase and per-bundle timings (always written to build-metrics.json)",
+    )
+    parser.add_argument(
+        "--delta-from",
+        action="append",
+        type=Path,
+        default=[],
+        metavar="PATH",
+        help="Previous bundle ZIP/-manifest.json (or a directory of them) to emit delta archives against (repeatable)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After the initial build, rebuild bundles whose inputs change until interrupted",
+    )
+    parser.add_argument(
+        "--poll-interval",
+        type=float,
+        default=0.5,
+        metavar="SECONDS",
+        help="--watch polling interval (default: 0.5)",
+    )
+    parser.add_argument(
+        "--debounce",
+        type=float,
+        default=0.3,
+        metavar="SECONDS",
+        help="--watch quiet period before rebuilding (default: 0.3)",
+    )
     args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be >= 1")
+    if args.compress_threads < 1:
+        parser.error("--compress-threads must be >= 1")
+    if args.reproducible:
+        try:
+            source_date_time()
+        except ValueError as exc:
+            parser.error(str(exc))
+    if args.poll_interval <= 0 or args.debounce < 0:
+        parser.error("--poll-interval must be > 0 and --debounce >= 0")
 
     DIST_DIR.mkdir(exist_ok=True)
     DIST_BUNDLES.mkdir(parents=True, exist_ok=True)
     DIST_METADATA.mkdir(parents=True, exist_ok=True)
-    TEMP_ROOT.mkdir(parents=True, exist_ok=True)
 
+    metrics = BuildMetrics()
     try:
-        run_preflight()
-        schema = load_schema(BUNDLE_SCHEMA_PATH)
-        stacks = load_stacks()
-        bundle_paths = discover_bundles(args.bundle_id, args.os or [])
+        with metrics.phase("preflight"):
+            data = load_ecosystem()
+            run_preflight(data)
+        with metrics.phase("discover"):
+            validator = load_bundle_validator()
+            stacks = data.stacks
+            bundle_paths = discover_bundles(args.bundle_id, args.os or [])
         if not bundle_paths:
             raise BundleError("No bundles found matching filters")
 
-        built: List[
-            Tuple[str, str, str, str | None, Path, str, List[str], List[str]]
-        ] = []
+        cache = BuildCache.load(BUILD_CACHE_PATH, verify=args.verify_cache)
+        built: List[BuildResult] = []
         failed = 0
-        for path in bundle_paths:
-            try:
-                result = build_bundle(path, schema, stacks)
-                built.append(result)
-                bundle_id, version, os_name, _, zip_path, _, _, _ = result
-                print(f"Built {bundle_id} ({version} / {os_name}) -> {zip_path.name}")
-            except Exception as exc:  # pragma: no cover - build guardrail
+        with metrics.phase("build"):
+            results = build_bundles(
+                bundle_paths,
+                validator,
+                stacks,
+                args.jobs,
+                cache,
+                args.force,
+                args.digest,
+                metrics,
+                args.compress_threads,
+                args.compression,
+                args.reproducible,
+            )
+        cache.save()
+        for path, result, exc in results:
+            if exc is not None:
                 failed += 1
-                import traceback
-
                 sys.stderr.write(f"Failed to build {path}: {exc}\n")
-                traceback.print_exc()
+                traceback.print_exception(type(exc), exc, exc.__traceback__)
+                continue
+            built.append(result)
+            action = "Reused" if result.zip_path.name in cache.hits else "Built"
+            print(
+                f"{action} {result.bundle_id} ({result.version} / {result.os_name}) -> {result.zip_path.name}"
+            )
 
         if failed:
             raise BundleError(f"{failed} bundle(s) failed")
 
         if built:
-            write_checksums(built)
-            write_index(built)
+            # Filtered builds only know about a subset of bundles, so they
+            # upsert into the shared metadata instead of replacing it.
+            merge = bool(args.bundle_id or args.os)
+            with metrics.phase("index"), metadata_lock():
+                write_checksums(built, merge=merge)
+                write_index(built, merge=merge)
+
+        if built and args.delta_from:
+            with metrics.phase("delta"):
+                write_deltas(built, args.delta_from)
+
+        metrics.write(BUILD_METRICS_PATH)
+        if args.timings:
+            metrics.print_table()
 
+        reused = sum(1 for r in built if r.zip_path.name in cache.hits)
         print(
-            f"Summary: discovered={len(bundle_paths)} built={len(built)} failed={failed} output_dir={DIST_BUNDLES}"
+            f"Summary: discovered={len(bundle_paths)} built={len(built) - reused} reused={reused} failed={failed} output_dir={DIST_BUNDLES}"
         )
+        if args.watch:
+            return watch_bundles(
+                args.bundle_id,
+                args.os or [],
+                validator,
+                data,
+                args.jobs,
+                cache,
+                args.digest,
+                args.poll_interval,
+                args.debounce,
+                args.compress_threads,
+                args.compression,
+                args.reproducible,
+            )
         return 0
     except BundleError as exc:
         sys.stderr.write(f"[bundle-builder] Error: {exc}\n")
@@ -0,0 +1,556 @@
+"""Streaming ZIP writer that can reuse already-compressed members.
+
+zipfile.ZipFile always compresses what it is given, so a file shared by
+several bundles is deflated once per archive. This module splits the two
+steps: compress_file/compress_bytes produce a CompressedMember, and
+ZipStreamWriter appends members verbatim. MemberCache lets concurrent
+bundle builds share the compressed data for files they have in common, and
+imap_ordered compresses one archive's members on several threads while
+keeping their order. CompressionPolicy picks a method (stored, deflate-N,
+bzip2, lzma or a benchmarked "auto") per file type, and normalize_member
+strips mtimes and modes for reproducible archives.
+"""
+from __future__ import annotations
+
+import bz2
+import hashlib
+import lzma
+import os
+import re
+import stat
+import struct
+import threading
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
+from functools import cached_property
+from pathlib import Path
+from typing import (
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+# Classic (non-ZIP64) format limits; bundles are nowhere near these.
+MAX_MEMBER_SIZE = 0xFFFFFFFF
+MAX_MEMBERS = 0xFFFF
+UTF8_FLAG = 0x800
+MSDOS_DIRECTORY = 0x10
+# Mode of generated members (e.g. BUNDLE_MANIFEST.json): a regular 0644 file,
+# as zipfile.writestr/make_archive would store it.
+REGULAR_FILE_ATTR = (stat.S_IFREG | 0o644) << 16
+# Minimum "version needed to extract" per method (APPNOTE 4.4.3).
+EXTRACT_VERSION = {
+    zipfile.ZIP_STORED: 20,
+    zipfile.ZIP_DEFLATED: 20,
+    zipfile.ZIP_BZIP2: 46,
+    zipfile.ZIP_LZMA: 63,
+}
+# General purpose flag bit 1: LZMA stream carries an end-of-stream marker.
+LZMA_EOS_FLAG = 0x2
+
+# Record layouts (APPNOTE 4.3.7, 4.3.12, 4.3.16), little-endian, signature first.
+LOCAL_HEADER_SIGNATURE = b"PK\x03\x04"
+# signature, version needed, reserved, flags, method, time, date, crc32,
+# compressed size, size, name length, extra length
+LOCAL_HEADER_STRUCT = "<4s2B4HL2L2H"
+LOCAL_HEADER_SIZE = struct.calcsize(LOCAL_HEADER_STRUCT)
+CENTRAL_DIR_SIGNATURE = b"PK\x01\x02"
+# signature, version made by, system, version needed, reserved, flags,
+# method, time, date, crc32, compressed size, size, name/extra/comment
+# lengths, disk number, internal attr, external attr, local header offset
+CENTRAL_DIR_STRUCT = "<4s4B4HL2L5H2L"
+END_OF_CENTRAL_DIR_SIGNATURE = b"PK\x05\x06"
+# signature, disk numbers, entries on disk, total entries, directory size,
+# directory offset, comment length
+END_OF_CENTRAL_DIR_STRUCT = "<4s4H2LH"
+
+# Earliest timestamp a ZIP can hold; used when SOURCE_DATE_EPOCH is unset.
+ZIP_EPOCH = (1980, 1, 1, 0, 0, 0)
+ZIP_EPOCH_SECONDS = 315532800
+
+# ZIP LZMA members are a raw LZMA1 stream behind a small header: the LZMA SDK
+# version (9.4), the size of the properties, then the 5 property bytes
+# ((pb * 5 + lp) * 9 + lc, dictionary size). These are the values zipfile
+# uses (xz preset 6), so archives are identical to zipfile's own output.
+LZMA_FILTER = {
+    "id": lzma.FILTER_LZMA1,
+    "dict_size": 1 << 23,
+    "lc": 3,
+    "lp": 0,
+    "pb": 2,
+}
+LZMA_HEADER = struct.pack("<BBH", 9, 4, 5) + struct.pack(
+    "<BI",
+    (LZMA_FILTER["pb"] * 5 + LZMA_FILTER["lp"]) * 9 + LZMA_FILTER["lc"],
+    LZMA_FILTER["dict_size"],
+)
+METHOD_RE = re.compile(r"^(?P<name>stored|deflate|bzip2|lzma)(?:-(?P<level>[1-9]))?$")
+AUTO = "auto"
+# Cheapest first; "auto" keeps the first one within AUTO_SIZE_TOLERANCE of
+# the smallest output, so incompressible data ends up stored and a slower
+# method has to earn its CPU with real savings. bzip2/lzma are left out:
+# many extractors (Windows Explorer, some unzip builds) cannot read them,
+# so they are only used when a policy names them explicitly.
+AUTO_CANDIDATES = ("stored", "deflate-1", "deflate-3", "deflate", "deflate-9")
+AUTO_SIZE_TOLERANCE = 0.02
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+@dataclass(frozen=True)
+class CompressedMember:
+    """A member's compressed payload plus the metadata needed to store it."""
+
+    data: bytes
+    crc: int
+    file_size: int
+    compress_type: int = zipfile.ZIP_DEFLATED
+    date_time: Tuple[int, int, int, int, int, int] = (1980, 1, 1, 0, 0, 0)
+    external_attr: int = REGULAR_FILE_ATTR
+    # Digest of the uncompressed content ("" when unknown, e.g. raw copies).
+    sha256: str = ""
+    # Method spec used ("deflate-9", ...); "" when unknown, e.g. raw copies.
+    method: str = ""
+    # (method, compressed bytes, seconds) for every candidate "auto" tried.
+    trials: Tuple[Tuple[str, int, float], ...] = field(default=(), compare=False)
+
+    @cached_property
+    def raw_sha256(self) -> str:
+        return hashlib.sha256(self.data).hexdigest()
+
+    def manifest_entry(self, arcname: str) -> dict:
+        """Describe the member well enough to rebuild its bytes exactly."""
+        return {
+            "name": arcname,
+            "size": self.file_size,
+            "sha256": self.sha256,
+            "rawSha256": self.raw_sha256,
+            "compressType": self.compress_type,
+            "method": self.method,
+            "crc": self.crc,
+            "dateTime": list(self.date_time),
+            "externalAttr": self.external_attr,
+        }
+
+
+@dataclass(frozen=True)
+class CompressionMethod:
+    name: str
+    compress_type: int
+    level: Optional[int] = None
+
+
+def parse_method(spec: str) -> CompressionMethod:
+    """Parse "stored", "deflate[-1..9]", "bzip2[-1..9]" or "lzma"."""
+    match = METHOD_RE.match(spec)
+    if not match or (match["name"] in {"stored", "lzma"} and match["level"]):
+        raise ValueError(f"Unknown compression method: {spec!r}")
+    compress_type = {
+        "stored": zipfile.ZIP_STORED,
+        "deflate": zipfile.ZIP_DEFLATED,
+        "bzip2": zipfile.ZIP_BZIP2,
+        "lzma": zipfile.ZIP_LZMA,
+    }[match["name"]]
+    level = int(match["level"]) if match["level"] else None
+    return CompressionMethod(spec, compress_type, level)
+
+
+def method_name(compress_type: int, level: int | None = None) -> str:
+    """Inverse of parse_method."""
+    name = {
+        zipfile.ZIP_STORED: "stored",
+        zipfile.ZIP_DEFLATED: "deflate",
+        zipfile.ZIP_BZIP2: "bzip2",
+        zipfile.ZIP_LZMA: "lzma",
+    }.get(compress_type, str(compress_type))
+    if level is not None and compress_type in (zipfile.ZIP_DEFLATED, zipfile.ZIP_BZIP2):
+        return f"{name}-{level}"
+    return name
+
+
+def validate_method(spec: str) -> str:
+    if spec != AUTO:
+        parse_method(spec)
+    return spec
+
+
+@dataclass(frozen=True)
+class CompressionPolicy:
+    """Compression method per member: by file extension, else the default."""
+
+    default: str = "deflate"
+    by_extension: Tuple[Tuple[str, str], ...] = ()
+
+    @classmethod
+    def from_config(
+        cls, config: dict | None, default: str = "deflate"
+    ) -> "CompressionPolicy":
+        """Build from a bundle's `compression` object ({default, byExtension})."""
+        config = config or {}
+        by_extension = {
+            ext.lower(): validate_method(spec)
+            for ext, spec in config.get("byExtension", {}).items()
+        }
+        return cls(
+            default=validate_method(config.get("default", default)),
+            # Longest suffix first so ".tar.gz" wins over ".gz".
+            by_extension=tuple(
+                sorted(by_extension.items(), key=lambda item: (-len(item[0]), item[0]))
+            ),
+        )
+
+    def method_for(self, arcname: str) -> str:
+        name = arcname.lower()
+        for ext, spec in self.by_extension:
+            if name.endswith(ext):
+                return spec
+        return self.default
+
+    def to_manifest(self) -> dict:
+        return {"default": self.default, "byExtension": dict(self.by_extension)}
+
+
+def compress_bytes(
+    payload: bytes,
+    compress_type: int = zipfile.ZIP_DEFLATED,
+    level: int | None = None,
+    date_time: Tuple[int, int, int, int, int, int] | None = None,
+    external_attr: int = REGULAR_FILE_ATTR,
+) -> CompressedMember:
+    method = method_name(compress_type, level)
+    if compress_type == zipfile.ZIP_DEFLATED:
+        level = zlib.Z_DEFAULT_COMPRESSION if level is None else level
+        comp = zlib.compressobj(level, zlib.DEFLATED, -15)
+        data = comp.compress(payload) + comp.flush()
+    elif compress_type == zipfile.ZIP_STORED:
+        data = payload
+    elif compress_type == zipfile.ZIP_BZIP2:
+        comp = bz2.BZ2Compressor(9 if level is None else level)
+        data = comp.compress(payload) + comp.flush()
+    elif compress_type == zipfile.ZIP_LZMA:
+        # Same stream layout as zipfile's LZMACompressor.
+        comp = lzma.LZMACompressor(lzma.FORMAT_RAW, filters=[LZMA_FILTER])
+        data = LZMA_HEADER + comp.compress(payload) + comp.flush()
+    else:
+        raise ValueError(f"Unsupported compression type: {compress_type}")
+    return CompressedMember(
+        data=data,
+        crc=zlib.crc32(payload),
+        file_size=len(payload),
+        compress_type=compress_type,
+        date_time=date_time or time.localtime(time.time())[:6],
+        external_attr=external_attr,
+        sha256=hashlib.sha256(payload).hexdigest(),
+        method=method,
+    )
+
+
+def compress_auto(payload: bytes, **kwargs) -> CompressedMember:
+    """Try every AUTO_CANDIDATES method on the payload and keep the best trade-off."""
+    results: List[CompressedMember] = []
+    trials: List[Tuple[str, int, float]] = []
+    for spec in AUTO_CANDIDATES:
+        start = time.perf_counter()
+        member = compress_with(payload, spec, **kwargs)
+        trials.append((spec, len(member.data), time.perf_counter() - start))
+        results.append(member)
+    smallest = min(len(m.data) for m in results)
+    chosen = next(
+        m for m in results if len(m.data) <= smallest * (1 + AUTO_SIZE_TOLERANCE)
+    )
+    return replace(chosen, trials=tuple(trials))
+
+
+def compress_with(payload: bytes, spec: str = "deflate", **kwargs) -> CompressedMember:
+    """Compress with a method spec ("deflate-9", "stored", "auto", ...)."""
+    if spec == AUTO:
+        return compress_auto(payload, **kwargs)
+    method = parse_method(spec)
+    return compress_bytes(payload, method.compress_type, method.level, **kwargs)
+
+
+def compress_file(path: Path, method: str = "deflate") -> CompressedMember:
+    """Compress a file, keeping its mtime and mode as zipfile.write would."""
+    st = path.stat()
+    date_time = time.localtime(st.st_mtime)[:6]
+    if date_time[0] < 1980:
+        date_time = (1980, 1, 1, 0, 0, 0)
+    return compress_with(
+        path.read_bytes(),
+        method,
+        date_time=date_time,
+        external_attr=(st.st_mode & 0xFFFF) << 16,
+    )
+
+
+def directory_member(path: Path) -> CompressedMember:
+    """An empty directory entry, matching what zipfile.write stores for a dir."""
+    st = path.stat()
+    date_time = time.localtime(st.st_mtime)[:6]
+    if date_time[0] < 1980:
+        date_time = (1980, 1, 1, 0, 0, 0)
+    return CompressedMember(
+        data=b"",
+        crc=0,
+        file_size=0,
+        compress_type=zipfile.ZIP_STORED,
+        date_time=date_time,
+        external_attr=(st.st_mode & 0xFFFF) << 16 | MSDOS_DIRECTORY,
+        sha256=hashlib.sha256(b"").hexdigest(),
+        method="stored",
+    )
+
+
+def source_date_time() -> Tuple[int, int, int, int, int, int]:
+    """Timestamp for reproducible members: SOURCE_DATE_EPOCH (UTC) or ZIP_EPOCH.
+
+    See https://reproducible-builds.org/specs/source-date-epoch/.
+    """
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if not epoch:
+        return ZIP_EPOCH
+    try:
+        seconds = int(epoch)
+    except ValueError:
+        raise ValueError(f"Invalid SOURCE_DATE_EPOCH: {epoch!r}") from None
+    return time.gmtime(max(seconds, ZIP_EPOCH_SECONDS))[:6]
+
+
+def normalize_member(
+    member: CompressedMember,
+    date_time: Tuple[int, int, int, int, int, int] = ZIP_EPOCH,
+) -> CompressedMember:
+    """Pin a member's timestamp and reduce its mode to 0644/0755.
+
+    Only the local/central header fields change; the compressed bytes are
+    shared with the original member.
+    """
+    mode = member.external_attr >> 16
+    if member.external_attr & MSDOS_DIRECTORY or stat.S_ISDIR(mode):
+        external_attr = (stat.S_IFDIR | 0o755) << 16 | MSDOS_DIRECTORY
+    else:
+        perm = 0o755 if mode & 0o111 else 0o644
+        external_attr = (stat.S_IFREG | perm) << 16
+    return replace(member, date_time=date_time, external_attr=external_attr)
+
+
+def imap_ordered(
+    func: Callable[[T], R], items: Iterable[T], threads: int = 1
+) -> Iterator[R]:
+    """Like map(func, items), running up to `threads` calls concurrently.
+
+    zlib releases the GIL while deflating, so members of a single archive
+    compress in parallel on threads. Results are still yielded in input
+    order (archives stay deterministic) and at most 2 * threads are held at
+    once, so memory does not grow with the archive.
+    """
+    if threads <= 1:
+        yield from map(func, items)
+        return
+    window = threads * 2
+    with ThreadPoolExecutor(
+        max_workers=threads, thread_name_prefix="zip-compress"
+    ) as pool:
+        pending: Deque[Future] = deque()
+        for item in items:
+            pending.append(pool.submit(func, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+class MemberCache:
+    """Compress each shared source file once, even across worker threads."""
+
+    def __init__(self, shared: set[Path] | None = None):
+        # Only files listed in `shared` are retained; everything else is
+        # compressed on demand so memory tracks the shared payload only.
+        self._shared = shared
+        self._lock = threading.Lock()
+        self._members: Dict[Tuple[Path, str], Future] = {}
+        self.hits = 0
+
+    def get(
+        self,
+        path: Path,
+        method: str = "deflate",
+        on_read: Callable[[int], None] | None = None,
+    ) -> CompressedMember:
+        """Return the compressed member; on_read(n) fires only if the file was read."""
+        if self._shared is not None and path not in self._shared:
+            member = compress_file(path, method)
+            if on_read:
+                on_read(member.file_size)
+            return member
+        key = (path, method)
+        with self._lock:
+            future = self._members.get(key)
+            owner = future is None
+            if owner:
+                future = self._members[key] = Future()
+            else:
+                self.hits += 1
+        if owner:
+            try:
+                future.set_result(compress_file(path, method))
+            except BaseException as exc:
+                future.set_exception(exc)
+            else:
+                if on_read:
+                    on_read(future.result().file_size)
+        return future.result()
+
+
+def read_raw_member(fp: BinaryIO, zinfo: zipfile.ZipInfo) -> CompressedMember:
+    """Read a member's compressed bytes from an open ZIP without inflating them."""
+    fp.seek(zinfo.header_offset)
+    header = fp.read(LOCAL_HEADER_SIZE)
+    fields = struct.unpack(LOCAL_HEADER_STRUCT, header)
+    if fields[0] != LOCAL_HEADER_SIGNATURE:
+        raise zipfile.BadZipFile(f"Bad local header for {zinfo.filename}")
+    name_len, extra_len = fields[10], fields[11]
+    fp.seek(name_len + extra_len, 1)
+    return CompressedMember(
+        data=fp.read(zinfo.compress_size),
+        crc=zinfo.CRC,
+        file_size=zinfo.file_size,
+        compress_type=zinfo.compress_type,
+        date_time=tuple(zinfo.date_time),
+        external_attr=zinfo.external_attr,
+    )
+
+
+def _encode_name(arcname: str) -> Tuple[bytes, int]:
+    try:
+        return arcname.encode("ascii"), 0
+    except UnicodeEncodeError:
+        return arcname.encode("utf-8"), UTF8_FLAG
+
+
+def _dos_datetime(dt: Tuple[int, int, int, int, int, int]) -> Tuple[int, int]:
+    dosdate = (dt[0] - 1980) << 9 | dt[1] << 5 | dt[2]
+    dostime = dt[3] << 11 | dt[4] << 5 | (dt[5] // 2)
+    return dosdate, dostime
+
+
+class ZipStreamWriter:
+    """Append pre-compressed members to a ZIP written strictly sequentially.
+
+    The target only needs write(); nothing is ever seeked, so it can be a
+    hashing sink or a pipe.
+    """
+
+    def __init__(self, fp: BinaryIO):
+        self._fp = fp
+        self._offset = 0
+        self._central: List[bytes] = []
+        self._names: set[str] = set()
+        # manifest_entry() for every member, in archive order.
+        self.entries: List[dict] = []
+
+    def _write(self, data: bytes) -> None:
+        self._fp.write(data)
+        self._offset += len(data)
+
+    def add(self, arcname: str, member: CompressedMember) -> None:
+        if arcname in self._names:
+            raise ValueError(f"Duplicate archive member: {arcname}")
+        if max(member.file_size, len(member.data), self._offset) > MAX_MEMBER_SIZE:
+            raise ValueError(f"Archive member too large for ZIP: {arcname}")
+        if len(self._central) >= MAX_MEMBERS:
+            raise ValueError("Too many archive members for ZIP")
+        self._names.add(arcname)
+        self.entries.append(member.manifest_entry(arcname))
+
+        name, flags = _encode_name(arcname)
+        if member.compress_type == zipfile.ZIP_LZMA:
+            flags |= LZMA_EOS_FLAG
+        dosdate, dostime = _dos_datetime(member.date_time)
+        version = EXTRACT_VERSION.get(member.compress_type, 20)
+        header_offset = self._offset
+        self._write(
+            struct.pack(
+                LOCAL_HEADER_STRUCT,
+                LOCAL_HEADER_SIGNATURE,
+                version,
+                0,
+                flags,
+                member.compress_type,
+                dostime,
+                dosdate,
+                member.crc,
+                len(member.data),
+                member.file_size,
+                len(name),
+                0,
+            )
+        )
+        self._write(name)
+        self._write(member.data)
+        self._central.append(
+            struct.pack(
+                CENTRAL_DIR_STRUCT,
+                CENTRAL_DIR_SIGNATURE,
+                version,
+                3,  # created on Unix, so external_attr carries the mode
+                version,
+                0,
+                flags,
+                member.compress_type,
+                dostime,
+                dosdate,
+                member.crc,
+                len(member.data),
+                member.file_size,
+                len(name),
+                0,
+                0,
+                0,
+                0,
+                member.external_attr,
+                header_offset,
+            )
+            + name
+        )
+
+    def close(self) -> None:
+        start = self._offset
+        for record in self._central:
+            self._write(record)
+        size = self._offset - start
+        if start > MAX_MEMBER_SIZE:
+            raise ValueError("Archive too large for ZIP")
+        count = len(self._central)
+        self._write(
+            struct.pack(
+                END_OF_CENTRAL_DIR_STRUCT,
+                END_OF_CENTRAL_DIR_SIGNATURE,
+                0,
+                0,
+                count,
+                count,
+                size,
+                start,
+                0,
+            )
+        )
+
+    def __enter__(self) -> "ZipStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
@@ -0,0 +1,221 @@
+"""Delta archives between two versions of a bundle ZIP.
+
+A delta is itself a ZIP holding only the members that were added or whose
+compressed bytes changed, plus DELTA_MANIFEST.json describing every member
+of the target archive. apply_delta() rebuilds the target from the base ZIP
+and the delta, copying compressed bytes verbatim, and verifies it against
+the expected member and archive digests.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import BinaryIO, Dict, List, Tuple
+
+from bundle_archive import (
+    CompressedMember,
+    ZipStreamWriter,
+    compress_bytes,
+    read_raw_member,
+)
+
+DELTA_FORMAT = 1
+DELTA_MANIFEST_NAME = "DELTA_MANIFEST.json"
+
+
+class DeltaError(Exception):
+    pass
+
+
+def _sha256_path(path: Path) -> str:
+    h = hashlib.sha256()
+    with path.open("rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def member_manifest(zip_path: Path) -> dict:
+    """Describe every member of an existing bundle ZIP (content + raw digests)."""
+    members: List[dict] = []
+    with zipfile.ZipFile(zip_path) as zf, zip_path.open("rb") as raw:
+        for zinfo in zf.infolist():
+            if zinfo.is_dir():
+                continue
+            content = hashlib.sha256()
+            with zf.open(zinfo) as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    content.update(chunk)
+            member = read_raw_member(raw, zinfo)
+            entry = member.manifest_entry(zinfo.filename)
+            entry["sha256"] = content.hexdigest()
+            members.append(entry)
+    return {
+        "filename": zip_path.name,
+        "sha256": _sha256_path(zip_path),
+        "members": members,
+    }
+
+
+def load_base_manifest(path: Path) -> dict:
+    """Accept either a previous bundle ZIP or its *-manifest.json."""
+    if path.suffix == ".zip":
+        return member_manifest(path)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if "members" not in data:
+        raise DeltaError(f"{path} is not a bundle member manifest")
+    return data
+
+
+def _open_sibling_temp(out_path: Path) -> Tuple[Path, BinaryIO]:
+    """A unique 0644 temp file next to out_path, so concurrent writers never collide."""
+    fd, tmp_name = tempfile.mkstemp(
+        prefix=f".{out_path.name}.", suffix=".tmp", dir=out_path.parent
+    )
+    out = os.fdopen(fd, "wb")
+    # mkstemp creates 0600; published archives keep the usual mode.
+    os.fchmod(out.fileno(), 0o644)
+    return Path(tmp_name), out
+
+
+def _member_from_entry(entry: dict, data: bytes) -> CompressedMember:
+    return CompressedMember(
+        data=data,
+        crc=entry["crc"],
+        file_size=entry["size"],
+        compress_type=entry["compressType"],
+        date_time=tuple(entry["dateTime"]),
+        external_attr=entry["externalAttr"],
+        sha256=entry["sha256"],
+    )
+
+
+def create_delta(base: dict, target_zip: Path, out_path: Path) -> dict:
+    """Write a delta that turns the `base` manifest's archive into `target_zip`.
+
+    Members whose compressed bytes are unchanged are taken from the base on
+    apply; everything else is copied (still compressed) into the delta.
+    """
+    target = member_manifest(target_zip)
+    base_raw = {m["name"]: m["rawSha256"] for m in base["members"]}
+    target_names = {m["name"] for m in target["members"]}
+
+    added: List[str] = []
+    changed: List[str] = []
+    entries: List[dict] = []
+    for member in target["members"]:
+        name = member["name"]
+        reuse = base_raw.get(name) == member["rawSha256"]
+        entries.append({**member, "source": "base" if reuse else "delta"})
+        if name not in base_raw:
+            added.append(name)
+        elif not reuse:
+            # Includes same-content members recompressed differently, so the
+            # rebuilt archive stays byte-identical to the target.
+            changed.append(name)
+
+    manifest = {
+        "format": DELTA_FORMAT,
+        "base": {"filename": base.get("filename"), "sha256": base.get("sha256")},
+        "target": {
+            "filename": target["filename"],
+            "sha256": target["sha256"],
+            "size": target_zip.stat().st_size,
+        },
+        "added": added,
+        "changed": changed,
+        "removed": sorted(set(base_raw) - target_names),
+        "members": entries,
+    }
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path, out = _open_sibling_temp(out_path)
+    try:
+        with out, zipfile.ZipFile(target_zip) as zf, target_zip.open(
+            "rb"
+        ) as raw, ZipStreamWriter(out) as writer:
+            for entry in entries:
+                if entry["source"] == "delta":
+                    zinfo = zf.getinfo(entry["name"])
+                    writer.add(entry["name"], read_raw_member(raw, zinfo))
+            writer.add(
+                DELTA_MANIFEST_NAME,
+                compress_bytes(json.dumps(manifest, indent=2).encode("utf-8")),
+            )
+        os.replace(tmp_path, out_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return manifest
+
+
+def read_delta_manifest(delta_zip: Path) -> dict:
+    with zipfile.ZipFile(delta_zip) as zf:
+        try:
+            manifest = json.loads(zf.read(DELTA_MANIFEST_NAME))
+        except KeyError:
+            raise DeltaError(f"{delta_zip} has no {DELTA_MANIFEST_NAME}") from None
+    if manifest.get("format") != DELTA_FORMAT:
+        raise DeltaError(f"Unsupported delta format: {manifest.get('format')}")
+    return manifest
+
+
+def apply_delta(base_zip: Path, delta_zip: Path, out_path: Path) -> dict:
+    """Rebuild the target bundle from base + delta and verify every digest."""
+    manifest = read_delta_manifest(delta_zip)
+    expected_base = manifest["base"].get("sha256")
+    if expected_base and _sha256_path(base_zip) != expected_base:
+        raise DeltaError(
+            f"{base_zip} does not match the delta's base ({manifest['base'].get('filename')})"
+        )
+
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path, out = _open_sibling_temp(out_path)
+    try:
+        with out, zipfile.ZipFile(base_zip) as base_zf, base_zip.open(
+            "rb"
+        ) as base_raw, zipfile.ZipFile(delta_zip) as delta_zf, delta_zip.open(
+            "rb"
+        ) as delta_raw, ZipStreamWriter(out) as writer:
+            sources = {"base": (base_zf, base_raw), "delta": (delta_zf, delta_raw)}
+            for entry in manifest["members"]:
+                zf, raw = sources[entry["source"]]
+                try:
+                    zinfo = zf.getinfo(entry["name"])
+                except KeyError:
+                    raise DeltaError(
+                        f"{entry['name']} missing from {entry['source']} archive"
+                    ) from None
+                data = read_raw_member(raw, zinfo).data
+                if hashlib.sha256(data).hexdigest() != entry["rawSha256"]:
+                    raise DeltaError(f"Digest mismatch for member {entry['name']}")
+                writer.add(entry["name"], _member_from_entry(entry, data))
+        verify_members(tmp_path, manifest["members"])
+        actual = _sha256_path(tmp_path)
+        if actual != manifest["target"]["sha256"]:
+            raise DeltaError(
+                f"Rebuilt archive sha256 {actual} != expected {manifest['target']['sha256']}"
+            )
+        os.replace(tmp_path, out_path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+    return manifest
+
+
+def verify_members(zip_path: Path, expected: List[dict]) -> None:
+    """Inflate every member and compare its content digest with the manifest."""
+    digests: Dict[str, str] = {e["name"]: e["sha256"] for e in expected}
+    with zipfile.ZipFile(zip_path) as zf:
+        names = [i.filename for i in zf.infolist() if not i.is_dir()]
+        if sorted(names) != sorted(digests):
+            raise DeltaError(f"{zip_path} member list does not match the manifest")
+        for name in names:
+            h = hashlib.sha256()
+            with zf.open(name) as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    h.update(chunk)
+            if h.hexdigest() != digests[name]:
+                raise DeltaError(f"Content digest mismatch for member {name}")
@@ -0,0 +1,109 @@
+"""Change detection for the bundle builder's --watch mode.
+
+ReverseIndex maps every input file (bundle JSON, stack JSON, artefacts) to
+the bundles that consume it, so an edit triggers a rebuild of only the
+dependent bundles. PollingWatcher uses stat() polling, which needs no
+platform-specific dependencies and copes with editors that save by
+replacing the file.
+"""
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, Optional, Set, Tuple
+
+# (mtime_ns, size, inode) - the inode catches atomic replace-on-save.
+FileStamp = Tuple[int, int, int]
+
+
+class ReverseIndex:
+    """Input path -> bundle paths that depend on it."""
+
+    def __init__(self) -> None:
+        self._files: Dict[Path, Set[Path]] = {}
+        # Directory artefacts cover everything beneath them, including
+        # files created after the index was built.
+        self._dirs: Dict[Path, Set[Path]] = {}
+
+    def add(self, bundle_path: Path, inputs: Iterable[Path]) -> None:
+        for path in inputs:
+            target = self._dirs if path.is_dir() else self._files
+            target.setdefault(path, set()).add(bundle_path)
+
+    def affected(self, changed: Iterable[Path]) -> Set[Path]:
+        bundles: Set[Path] = set()
+        for path in changed:
+            bundles |= self._files.get(path, set())
+            for directory, dependents in self._dirs.items():
+                if path == directory or directory in path.parents:
+                    bundles |= dependents
+        return bundles
+
+    def watched_files(self) -> Set[Path]:
+        files = set(self._files)
+        for directory in self._dirs:
+            files.update(p for p in directory.rglob("*") if p.is_file())
+        return files
+
+    def __len__(self) -> int:
+        return len(self._files) + len(self._dirs)
+
+
+def snapshot(paths: Iterable[Path]) -> Dict[Path, Optional[FileStamp]]:
+    stamps: Dict[Path, Optional[FileStamp]] = {}
+    for path in paths:
+        try:
+            st = os.stat(path)
+        except OSError:
+            stamps[path] = None
+        else:
+            stamps[path] = (st.st_mtime_ns, st.st_size, st.st_ino)
+    return stamps
+
+
+def changed_paths(
+    before: Dict[Path, Optional[FileStamp]], after: Dict[Path, Optional[FileStamp]]
+) -> Set[Path]:
+    # A path only present on one side was created or deleted (or became
+    # watched because the index grew); treat both as changes.
+    return {
+        path
+        for path in before.keys() | after.keys()
+        if before.get(path) != after.get(path)
+    }
+
+
+class PollingWatcher:
+    """Poll a (re-evaluated) set of paths and report debounced batches of changes."""
+
+    def __init__(
+        self,
+        paths: Callable[[], Iterable[Path]],
+        interval: float = 0.5,
+        debounce: float = 0.3,
+    ):
+        self._paths = paths
+        self.interval = interval
+        self.debounce = debounce
+        self._stamps = snapshot(self._paths())
+
+    def poll(self) -> Set[Path]:
+        current = snapshot(self._paths())
+        changed = changed_paths(self._stamps, current)
+        self._stamps = current
+        return changed
+
+    def wait(self) -> Set[Path]:
+        """Block until something changed and then stayed quiet for `debounce` seconds."""
+        pending: Set[Path] = set()
+        last_change = 0.0
+        while True:
+            time.sleep(min(self.interval, self.debounce) if pending else self.interval)
+            changed = self.poll()
+            now = time.monotonic()
+            if changed:
+                pending |= changed
+                last_change = now
+            elif pending and now - last_change >= self.debounce:
+                return pending
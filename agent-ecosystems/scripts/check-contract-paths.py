@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""Check file paths against an agent contract's allowedPaths/forbiddenPaths.
+
+Usage:
+  python3 agent-ecosystems/scripts/check-contract-paths.py --contract <agent-id> [PATH ...]
+  git diff --name-only | python3 agent-ecosystems/scripts/check-contract-paths.py --contract <agent-id>
+
+Paths are read from the arguments, or one per line from stdin. Every path
+that is forbidden or not covered by allowedPaths is printed; the exit code
+is 1 if there were any. Glob semantics are described in path_globs.
+"""
+from __future__ import annotations
+
+import argparse
+import sys
+
+from ecosystem_validation import load_contracts
+from path_globs import PathPolicy
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Check paths against an agent contract's path globs"
+    )
+    parser.add_argument("--contract", required=True, help="Contract (agent) id")
+    parser.add_argument("paths", nargs="*", help="Paths to check (default: stdin)")
+    args = parser.parse_args()
+
+    contract = load_contracts().get(args.contract)
+    if contract is None:
+        sys.stderr.write(f"[contract-paths] Error: contract not found: {args.contract}\n")
+        return 1
+
+    paths = args.paths or [line.strip() for line in sys.stdin if line.strip()]
+    violations = PathPolicy.from_contract(contract).check(paths)
+    for path, reasons in violations.items():
+        print(f"{path}: {', '.join(reasons)}")
+    print(
+        f"Checked {len(paths)} path(s) against {args.contract}: "
+        f"{len(violations)} violation(s)",
+        file=sys.stderr,
+    )
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""Self-check: incremental log summaries must match full rescans.
+
+Writes sample run logs to a temporary directory and compares the report of
+SummaryState.refresh() (the default summarise-logs mode) with that of
+summarise_files() (--no-cache), with one and several jobs. The cases
+cover a last line without a trailing newline, lines appended across runs
+(including completing a partial line), and a truncated file.
+
+Usage:
+  python3 agent-ecosystems/scripts/check-log-summary.py
+"""
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+from log_summary import SummaryState, log_files, summarise_files
+
+
+def _line(agent: str, duration: int, status: str = "success") -> str:
+    return json.dumps({"agentId": agent, "status": status, "durationMs": duration})
+
+
+def _compare(label: str, log_dir: Path, state_path: Path) -> List[str]:
+    paths = log_files(log_dir)
+    state = SummaryState.load(state_path)
+    cached = state.refresh(paths).report()
+    state.save()
+    errors = []
+    for jobs in (1, 2):
+        full = summarise_files(paths, jobs=jobs).report()
+        if cached != full:
+            errors.append(f"{label}: incremental report differs from --no-cache --jobs {jobs}")
+    return errors
+
+
+def main() -> int:
+    errors: List[str] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        log_dir = Path(tmp) / "runs"
+        log_dir.mkdir()
+        state_path = Path(tmp) / "state.json"
+        first, second = log_dir / "a.jsonl", log_dir / "b.jsonl"
+
+        # Last line without a trailing newline.
+        first.write_text(_line("a", 10) + "\n" + _line("a", 20), encoding="utf-8")
+        second.write_text(_line("b", 5) + "\n", encoding="utf-8")
+        errors += _compare("unterminated last line", log_dir, state_path)
+        errors += _compare("unterminated last line (warm)", log_dir, state_path)
+
+        # Complete the partial line, then append a partial fragment.
+        with first.open("a", encoding="utf-8") as handle:
+            handle.write("\n" + _line("c", 30) + "\n" + _line("a", 40)[:12])
+        errors += _compare("appended lines", log_dir, state_path)
+
+        # Truncated in place.
+        first.write_text(_line("d", 1) + "\n", encoding="utf-8")
+        errors += _compare("truncated file", log_dir, state_path)
+
+    if errors:
+        print("Errors:")
+        for error in errors:
+            print(f"- {error}")
+        return 1
+    print("Log summary check passed.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,348 @@
+"""Run agent circuits (agent-ecosystems/circuits/*.circuit.yaml) with asyncio.
+
+plan_circuit() turns a circuit's `pattern`, `entryAgent`, agents and steps
+into a dependency graph of CircuitSteps:
+
+- handoff: every agent in turn, entry agent first; each step waits for the
+  previous one and sees its reply.
+- manager-worker: the entry agent plans, every other agent works on its
+  step concurrently, then the entry agent reviews all worker replies.
+- parallel: every agent runs its step at the same time.
+
+Step i of the circuit is the message for the i-th agent in that order.
+CircuitExecutor starts a step as soon as all the steps it depends on have
+finished, so independent branches overlap. Each agent has one concurrency
+limit per executor, shared by every circuit it runs (an agent's capacity
+does not grow with the number of circuits using it): the `maxConcurrency`
+on the circuit's agent entry, or the executor default. Circuits that
+resolve different limits for the same agent are rejected with
+CircuitError. Backends are the synchronous AgentBackends from
+scenario_harness, run on a thread pool. Every step records when it became
+ready, how long it queued for its agent and how long it ran, so a run shows
+wall time against the serial sum and the critical path.
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+
+from ecosystem_validation import EcosystemData
+from scenario_harness import (
+    AgentBackend,
+    AgentReply,
+    AgentRequest,
+    ToolBox,
+    stub_servers_for,
+)
+
+PATTERNS = ("handoff", "manager-worker", "parallel")
+
+
+class CircuitError(Exception):
+    pass
+
+
+@dataclass(frozen=True)
+class CircuitStep:
+    id: str
+    agent_id: str
+    message: str
+    after: Tuple[str, ...] = ()
+
+
+def _message(steps: List[str], index: int, default: str) -> str:
+    return steps[index] if index < len(steps) else default
+
+
+def plan_circuit(circuit: dict) -> List[CircuitStep]:
+    """Steps for `circuit` in a dependency-respecting order."""
+    agents = [a.get("id") for a in circuit.get("agents", [])]
+    if not agents:
+        raise CircuitError(f"Circuit '{circuit.get('id')}' has no agents")
+    entry = circuit.get("entryAgent") or agents[0]
+    if entry not in agents:
+        raise CircuitError(
+            f"Circuit '{circuit.get('id')}' entryAgent '{entry}' is not one of its agents"
+        )
+    order = [entry] + [a for a in agents if a != entry]
+    steps = [str(s) for s in circuit.get("steps") or []]
+    pattern = circuit.get("pattern")
+
+    plan: List[CircuitStep] = []
+    if pattern == "handoff":
+        for i, agent in enumerate(order):
+            plan.append(
+                CircuitStep(
+                    f"{i + 1}:{agent}",
+                    agent,
+                    _message(steps, i, f"Continue the handoff as {agent}."),
+                    after=(plan[-1].id,) if plan else (),
+                )
+            )
+    elif pattern == "manager-worker":
+        manager, workers = order[0], order[1:]
+        plan.append(
+            CircuitStep(f"1:{manager}", manager, _message(steps, 0, "Plan the work."))
+        )
+        for k, worker in enumerate(workers):
+            plan.append(
+                CircuitStep(
+                    f"{k + 2}:{worker}",
+                    worker,
+                    _message(steps, k + 1, f"Carry out the work assigned to {worker}."),
+                    after=(plan[0].id,),
+                )
+            )
+        if workers:
+            plan.append(
+                CircuitStep(
+                    f"{len(plan) + 1}:{manager}",
+                    manager,
+                    "Review and combine the workers' results.",
+                    after=tuple(step.id for step in plan[1:]),
+                )
+            )
+    elif pattern == "parallel":
+        for i, agent in enumerate(order):
+            plan.append(
+                CircuitStep(f"{i + 1}:{agent}", agent, _message(steps, i, f"Run as {agent}."))
+            )
+    else:
+        raise CircuitError(
+            f"Circuit '{circuit.get('id')}' has unsupported pattern '{pattern}' "
+            f"(expected one of: {', '.join(PATTERNS)})"
+        )
+    return plan
+
+
+@dataclass
+class StepRun:
+    step: CircuitStep
+    ready_ms: float = 0.0
+    start_ms: float = 0.0
+    duration_ms: float = 0.0
+    tool_calls: int = 0
+    reply: Optional[AgentReply] = None
+    error: Optional[str] = None
+
+    @property
+    def queued_ms(self) -> float:
+        return self.start_ms - self.ready_ms
+
+    @property
+    def status(self) -> str:
+        return "success" if self.error is None else "failure"
+
+    def to_json(self) -> dict:
+        return {
+            "id": self.step.id,
+            "agentId": self.step.agent_id,
+            "after": list(self.step.after),
+            "message": self.step.message,
+            "status": self.status,
+            "readyMs": round(self.ready_ms, 3),
+            "startMs": round(self.start_ms, 3),
+            "queuedMs": round(self.queued_ms, 3),
+            "durationMs": round(self.duration_ms, 3),
+            "toolCalls": self.tool_calls,
+            "reply": self.reply.text if self.reply else None,
+            "error": self.error,
+        }
+
+
+@dataclass
+class CircuitRun:
+    circuit_id: str
+    pattern: str
+    stack_id: str
+    steps: List[StepRun] = field(default_factory=list)
+    wall_ms: float = 0.0
+
+    @property
+    def errors(self) -> List[str]:
+        return [f"{self.circuit_id} {s.step.id}: {s.error}" for s in self.steps if s.error]
+
+    @property
+    def status(self) -> str:
+        return "success" if not self.errors else "failure"
+
+    @property
+    def serial_ms(self) -> float:
+        """Time the same steps would take back to back."""
+        return sum(s.duration_ms for s in self.steps)
+
+    @property
+    def critical_path_ms(self) -> float:
+        """Longest chain of dependent step durations (the wall-time floor)."""
+        finish: Dict[str, float] = {}
+        for run in self.steps:
+            start = max((finish[d] for d in run.step.after), default=0.0)
+            finish[run.step.id] = start + run.duration_ms
+        return max(finish.values(), default=0.0)
+
+    def to_json(self) -> dict:
+        return {
+            "circuitId": self.circuit_id,
+            "pattern": self.pattern,
+            "stackId": self.stack_id,
+            "status": self.status,
+            "wallMs": round(self.wall_ms, 3),
+            "serialMs": round(self.serial_ms, 3),
+            "criticalPathMs": round(self.critical_path_ms, 3),
+            "steps": [s.to_json() for s in self.steps],
+        }
+
+
+class CircuitExecutor:
+    """Schedule circuit steps on an asyncio loop against an AgentBackend."""
+
+    def __init__(
+        self,
+        data: EcosystemData,
+        backend: AgentBackend,
+        agent_concurrency: int = 1,
+        server_latency: float = 0.0,
+    ):
+        if agent_concurrency < 1:
+            raise ValueError("agent_concurrency must be >= 1")
+        self.data = data
+        self.backend = backend
+        self.agent_concurrency = agent_concurrency
+        self.server_latency = server_latency
+        # agent id -> (limit, circuit that set it); fixed for the executor.
+        self._limit_sources: Dict[str, Tuple[int, str]] = {}
+        # Shared by every circuit this executor runs concurrently; rebuilt
+        # per event loop because asyncio primitives are bound to one loop.
+        self._limits: Dict[str, asyncio.Semaphore] = {}
+        self._limits_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _agent_limit(self, circuit_id: str, agent: dict) -> int:
+        raw = agent.get("maxConcurrency")
+        if raw is None:
+            return self.agent_concurrency
+        try:
+            limit = int(raw)
+        except (TypeError, ValueError):
+            limit = 0
+        if isinstance(raw, (bool, float)) or limit < 1:
+            raise CircuitError(
+                f"Circuit '{circuit_id}' sets maxConcurrency {raw!r} for agent "
+                f"'{agent.get('id')}'; expected a positive integer"
+            )
+        return limit
+
+    def check_limits(self, circuit: dict) -> None:
+        """Record the circuit's per-agent limits; CircuitError if invalid or conflicting."""
+        circuit_id = circuit.get("id", "")
+        for agent in circuit.get("agents", []):
+            limit = self._agent_limit(circuit_id, agent)
+            known = self._limit_sources.setdefault(agent.get("id"), (limit, circuit_id))
+            if known[0] != limit:
+                raise CircuitError(
+                    f"Circuit '{circuit_id}' sets maxConcurrency {limit} for agent "
+                    f"'{agent.get('id')}', but circuit '{known[1]}' uses {known[0]}; "
+                    "the limit is shared per agent across circuits"
+                )
+
+    def _agent_limits(self, circuit: dict) -> Dict[str, asyncio.Semaphore]:
+        self.check_limits(circuit)
+        loop = asyncio.get_running_loop()
+        if self._limits_loop is not loop:
+            self._limits, self._limits_loop = {}, loop
+        for agent in circuit.get("agents", []):
+            agent_id = agent.get("id")
+            if agent_id not in self._limits:
+                self._limits[agent_id] = asyncio.Semaphore(self._limit_sources[agent_id][0])
+        return self._limits
+
+    async def run(self, circuit: dict) -> CircuitRun:
+        circuit_id = circuit.get("id", "")
+        plan = plan_circuit(circuit)
+        missing = sorted({s.agent_id for s in plan} - set(self.data.agents))
+        if missing:
+            raise CircuitError(
+                f"Circuit '{circuit_id}' references unknown agent(s): {', '.join(missing)}"
+            )
+        run = CircuitRun(circuit_id, circuit.get("pattern", ""), circuit.get("stackId", ""))
+        runs = {step.id: StepRun(step) for step in plan}
+        run.steps = [runs[step.id] for step in plan]
+        limits = self._agent_limits(circuit)
+        loop = asyncio.get_running_loop()
+        # One thread per step: concurrency is bounded by the dependency graph
+        # and the per-agent semaphores, not by the pool.
+        pool = ThreadPoolExecutor(max_workers=len(plan), thread_name_prefix="circuit")
+        tasks: Dict[str, asyncio.Task] = {}
+        t0 = time.perf_counter()
+
+        def elapsed_ms() -> float:
+            return (time.perf_counter() - t0) * 1000
+
+        async def run_step(step: CircuitStep) -> None:
+            if step.after:
+                await asyncio.gather(*(tasks[dep] for dep in step.after))
+            record = runs[step.id]
+            record.ready_ms = record.start_ms = elapsed_ms()
+            failed = [dep for dep in step.after if runs[dep].error]
+            if failed:
+                record.error = f"skipped: dependency {', '.join(failed)} failed"
+                return
+            async with limits[step.agent_id]:
+                record.start_ms = elapsed_ms()
+                agent = self.data.agents[step.agent_id]
+                tools = ToolBox(
+                    stub_servers_for(agent.get("toolsets", []), self.data, self.server_latency)
+                )
+                request = AgentRequest(
+                    agent_id=step.agent_id,
+                    agent=agent,
+                    contract=self.data.contracts.get(step.agent_id),
+                    scenario={"id": circuit_id, "circuitId": circuit_id, "inputs": [step.message]},
+                    message=step.message,
+                    turn=0,
+                    tools=tools,
+                    history=[runs[dep].reply for dep in step.after if runs[dep].reply],
+                )
+                try:
+                    record.reply = await loop.run_in_executor(
+                        pool, self.backend.respond, request
+                    )
+                except Exception as exc:  # recorded per step; dependants are skipped
+                    record.error = f"backend error: {exc}"
+                record.duration_ms = elapsed_ms() - record.start_ms
+                record.tool_calls = len(tools.calls)
+
+        try:
+            for step in plan:
+                tasks[step.id] = asyncio.create_task(run_step(step))
+            await asyncio.gather(*tasks.values())
+        finally:
+            pool.shutdown(wait=True)
+        run.wall_ms = elapsed_ms()
+        return run
+
+    async def run_many(self, circuits: List[dict], concurrent: bool = False) -> List[CircuitRun]:
+        """Run circuits one after another (default) or all at once.
+
+        Per-agent limits of all circuits are checked before any of them runs.
+        """
+        for circuit in circuits:
+            self.check_limits(circuit)
+        if concurrent:
+            return list(await asyncio.gather(*(self.run(c) for c in circuits)))
+        return [await self.run(circuit) for circuit in circuits]
+
+
+def run_circuits(
+    circuits: List[dict],
+    data: EcosystemData,
+    backend: AgentBackend,
+    agent_concurrency: int = 1,
+    server_latency: float = 0.0,
+    concurrent: bool = False,
+) -> List[CircuitRun]:
+    """Synchronous entry point: run `circuits` on a fresh event loop."""
+    executor = CircuitExecutor(data, backend, agent_concurrency, server_latency)
+    return asyncio.run(executor.run_many(circuits, concurrent))
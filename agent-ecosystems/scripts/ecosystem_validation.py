@@ -0,0 +1,559 @@
+"""Importable validators for agent ecosystem configs and scenarios.
+
+Shared by validate-ecosystem-configs.py, run-agent-scenarios.py and the
+bundle builder's preflight so every caller parses the ecosystem once and
+gets structured results instead of scraping CLI output.
+"""
+from __future__ import annotations
+
+import json
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import cached_property
+from importlib.metadata import version
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import yaml
+from jsonschema import Draft202012Validator
+
+import path_globs
+import schema_registry
+from path_globs import PathPolicy
+from schema_registry import get_registry, schema_errors
+from validation_cache import (
+    ValidationCache,
+    cache_name,
+    dependency_map,
+    ruleset_digest,
+)
+
+ROOT = Path(__file__).resolve().parents[2]
+ECOSYSTEM_ROOT = ROOT / "agent-ecosystems"
+SCHEMA_DIR = ECOSYSTEM_ROOT / "schemas"
+TEST_ROOT = ECOSYSTEM_ROOT / "tests"
+SCENARIO_DIR = TEST_ROOT / "scenarios"
+SCENARIO_SCHEMA_PATH = TEST_ROOT / "scenario.schema.yaml"
+CONTRACT_DIR = ECOSYSTEM_ROOT / "contracts"
+OUTPUT_FIXTURE_DIR = TEST_ROOT / "output-fixtures"
+CIRCUIT_DIR = ECOSYSTEM_ROOT / "circuits"
+
+# Map subdirectory to schema filename
+SCHEMA_MAP = {
+    "agents": "agent.schema.json",
+    "toolsets": "toolset.schema.json",
+    "stacks": "stack.schema.json",
+    "bundles": "bundle.schema.json",
+}
+# Files that can define a referenced id, per kind (under ECOSYSTEM_ROOT/<kind>).
+SOURCE_GLOBS = {
+    "agents": "*.json",
+    "toolsets": "*.json",
+    "contracts": "*.contract.json",
+    "circuits": "*.circuit.yaml",
+}
+
+
+def load_json_from_path(path: Path) -> dict:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except json.JSONDecodeError as exc:
+        # Name the file: the decoder's message only has line and column.
+        raise json.JSONDecodeError(f"{path}: {exc.msg}", exc.doc, exc.pos) from None
+
+
+def load_json_files(directory: Path) -> Dict[str, dict]:
+    items: Dict[str, dict] = {}
+    for path in sorted(directory.glob("*.json")):
+        data = load_json_from_path(path)
+        items[data["id"]] = data
+    return items
+
+
+def scenario_validator() -> Draft202012Validator:
+    if not SCENARIO_SCHEMA_PATH.exists():
+        raise FileNotFoundError(f"Missing scenario schema: {SCENARIO_SCHEMA_PATH}")
+    return get_registry().validator_for_file(SCENARIO_SCHEMA_PATH)
+
+
+def load_contracts(paths: Dict[str, Path] | None = None) -> Dict[str, dict]:
+    """Contracts by id; `paths`, if given, is filled with id -> file."""
+    contracts: Dict[str, dict] = {}
+    if not CONTRACT_DIR.exists():
+        return contracts
+    for path in sorted(CONTRACT_DIR.glob("*.contract.json")):
+        data = load_json_from_path(path)
+        contracts[data.get("id")] = data
+        if paths is not None:
+            paths[data.get("id")] = path
+    return contracts
+
+
+def structured_output_validator(
+    schema_path: str | None,
+) -> Draft202012Validator | None:
+    if not schema_path:
+        return None
+    path = ROOT / schema_path
+    if not path.exists():
+        raise FileNotFoundError(f"Structured output schema missing: {path}")
+    return get_registry().validator_for_file(path)
+
+
+def load_circuits(paths: Dict[str, Path] | None = None) -> Dict[str, dict]:
+    """Circuits by id; `paths`, if given, is filled with id -> file."""
+    circuits: Dict[str, dict] = {}
+    if not CIRCUIT_DIR.exists():
+        return circuits
+    for path in sorted(CIRCUIT_DIR.glob("*.circuit.yaml")):
+        data = yaml.safe_load(path.read_text(encoding="utf-8"))
+        circuits[data.get("id")] = data
+        if paths is not None:
+            paths[data.get("id")] = path
+    return circuits
+
+
+@dataclass
+class EcosystemData:
+    """Parsed ecosystem files, loaded once and shared by every validator."""
+
+    # subdir (agents/toolsets/stacks/bundles) -> {path: parsed JSON}
+    documents: Dict[str, Dict[Path, dict]]
+    contracts: Dict[str, dict]
+    circuits: Dict[str, dict]
+    # kind (agents/toolsets/contracts/circuits) -> {id: defining file}
+    sources: Dict[str, Dict[str, Path]] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls) -> "EcosystemData":
+        documents: Dict[str, Dict[Path, dict]] = {}
+        sources: Dict[str, Dict[str, Path]] = {"contracts": {}, "circuits": {}}
+        for subdir in SCHEMA_MAP:
+            target_dir = ECOSYSTEM_ROOT / subdir
+            if not target_dir.exists():
+                continue
+            documents[subdir] = {
+                path: load_json_from_path(path)
+                for path in sorted(target_dir.glob("*.json"))
+            }
+            sources[subdir] = {
+                data["id"]: path
+                for path, data in documents[subdir].items()
+                if "id" in data
+            }
+        return cls(
+            documents=documents,
+            contracts=load_contracts(sources["contracts"]),
+            circuits=load_circuits(sources["circuits"]),
+            sources=sources,
+        )
+
+    def source_path(self, kind: str, item_id: object) -> Path | None:
+        return self.sources.get(kind, {}).get(item_id)
+
+    def by_id(self, subdir: str) -> Dict[str, dict]:
+        return {
+            data["id"]: data
+            for data in self.documents.get(subdir, {}).values()
+            if "id" in data
+        }
+
+    @cached_property
+    def agents(self) -> Dict[str, dict]:
+        return self.by_id("agents")
+
+    @cached_property
+    def toolsets(self) -> Dict[str, dict]:
+        return self.by_id("toolsets")
+
+    @cached_property
+    def stacks(self) -> Dict[str, dict]:
+        return self.by_id("stacks")
+
+
+@dataclass
+class ConfigReport:
+    checked: Dict[str, int] = field(default_factory=dict)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+@dataclass
+class ScenarioResult:
+    path: Path
+    scenario: dict
+    errors: List[str] = field(default_factory=list)
+    warnings: List[str] = field(default_factory=list)
+
+    @property
+    def status(self) -> str:
+        return "OK" if not self.errors else "FAIL"
+
+    @property
+    def notes(self) -> str:
+        if self.errors:
+            return f"{len(self.errors)} error(s)"
+        if self.warnings:
+            return f"{len(self.warnings)} warning(s)"
+        return ""
+
+
+@dataclass
+class ScenarioReport:
+    results: List[ScenarioResult] = field(default_factory=list)
+    # Scenarios skipped by validate_scenarios(changed_only=True), with their
+    # cached results; their errors still count towards errors/ok.
+    skipped: List[ScenarioResult] = field(default_factory=list)
+
+    @property
+    def unchanged(self) -> int:
+        return len(self.skipped)
+
+    @property
+    def failed_unchanged(self) -> List[ScenarioResult]:
+        return [r for r in self.skipped if r.errors]
+
+    @property
+    def errors(self) -> List[str]:
+        return [e for r in self.results + self.skipped for e in r.errors]
+
+    @property
+    def warnings(self) -> List[str]:
+        return [w for r in self.results for w in r.warnings]
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors
+
+
+def validate_file(
+    path: Path, instance: dict, validator: Draft202012Validator
+) -> List[str]:
+    return schema_errors(validator, instance, path, separator=" / ")
+
+
+def _validator_sources() -> List[Path | str]:
+    return [
+        Path(__file__).resolve(),
+        Path(schema_registry.__file__).resolve(),
+        Path(path_globs.__file__).resolve(),
+        f"jsonschema={version('jsonschema')}",
+        f"root={ROOT}",
+    ]
+
+
+def open_config_cache() -> ValidationCache:
+    """Result cache for validate_configs, invalidated by any schema edit."""
+    schemas = sorted(SCHEMA_DIR.glob("*.schema.json"))
+    return ValidationCache.open(
+        "ecosystem-configs", ruleset_digest(*_validator_sources(), *schemas)
+    )
+
+
+def open_scenario_cache() -> ValidationCache:
+    """Result cache for validate_scenarios, invalidated by scenario schema edits."""
+    return ValidationCache.open(
+        "ecosystem-scenarios",
+        ruleset_digest(*_validator_sources(), SCENARIO_SCHEMA_PATH),
+    )
+
+
+def validate_configs(
+    data: EcosystemData, cache: ValidationCache | None = None
+) -> ConfigReport:
+    """Validate agents/toolsets/stacks/bundles JSON against their schemas.
+
+    Each document is validated on its own, so a cache hit only needs the
+    file's content (the schemas are part of the cache's rule-set).
+    """
+    registry = get_registry()
+    report = ConfigReport()
+    for subdir, schema_file in SCHEMA_MAP.items():
+        if schema_file not in registry.schemas:
+            report.errors.append(f"Missing schema: {SCHEMA_DIR / schema_file}")
+            continue
+        if subdir not in data.documents:
+            continue
+        for path, instance in data.documents[subdir].items():
+            if cache is None:
+                report.errors.extend(
+                    validate_file(path, instance, registry.validator(schema_file))
+                )
+                continue
+            name, key = cache_name(path), cache.key(path)
+            cached = cache.lookup(name, key)
+            if cached is None:
+                cached = {
+                    "errors": validate_file(
+                        path, instance, registry.validator(schema_file)
+                    )
+                }
+                cache.store(name, key, cached)
+            report.errors.extend(cached["errors"])
+        report.checked[subdir] = len(data.documents[subdir])
+    if cache is not None:
+        cache.prune(
+            cache_name(path) for docs in data.documents.values() for path in docs
+        )
+    return report
+
+
+def validate_output_fixture(
+    scenario_id: str, contract: dict, validator: Draft202012Validator | None
+) -> List[str]:
+    errors: List[str] = []
+    if not validator:
+        return errors
+    fixture_path = OUTPUT_FIXTURE_DIR / f"{scenario_id}.json"
+    if not fixture_path.exists():
+        errors.append(f"Fixture missing for structured output: {fixture_path}")
+        return errors
+    fixture = load_json_from_path(fixture_path)
+    return schema_errors(validator, fixture, fixture_path)
+
+
+def validate_against_schema(
+    instance: dict, validator: Draft202012Validator, path: Path
+) -> List[str]:
+    return schema_errors(validator, instance, path)
+
+
+def validate_cross_references(
+    scenario: dict,
+    agents: Dict[str, dict],
+    toolsets: Dict[str, dict],
+    contracts: Dict[str, dict],
+    circuits: Dict[str, dict],
+    path: Path,
+) -> List[str]:
+    errors: List[str] = []
+    agent_id = scenario.get("agentId")
+    if agent_id not in agents:
+        errors.append(f"{path}: agentId '{agent_id}' not found in agents/")
+    else:
+        agent_toolsets = set(agents[agent_id].get("toolsets", []))
+        for ts in scenario.get("toolsets", []):
+            if ts not in toolsets:
+                errors.append(f"{path}: toolset '{ts}' not found in toolsets/")
+            if ts not in agent_toolsets:
+                errors.append(
+                    f"{path}: toolset '{ts}' not listed on agent '{agent_id}'"
+                )
+        if contracts and agent_id not in contracts:
+            errors.append(f"{path}: contract missing for agent '{agent_id}'")
+        elif contracts and agent_id in contracts:
+            contract_toolsets = set(contracts[agent_id].get("toolsets", []))
+            for ts in scenario.get("toolsets", []):
+                if ts not in contract_toolsets:
+                    errors.append(
+                        f"{path}: toolset '{ts}' not allowed by contract for '{agent_id}'"
+                    )
+    circuit_id = scenario.get("circuitId")
+    if circuit_id:
+        if circuit_id not in circuits:
+            errors.append(f"{path}: circuitId '{circuit_id}' not found")
+        else:
+            circuit_agents = {
+                a.get("id") for a in circuits[circuit_id].get("agents", [])
+            }
+            if agent_id not in circuit_agents:
+                errors.append(
+                    f"{path}: circuitId '{circuit_id}' does not include agent '{agent_id}'"
+                )
+    return errors
+
+
+def check_contract_warnings(
+    scenario: dict, contract: dict | None, path: Path
+) -> List[str]:
+    warnings: List[str] = []
+    if not contract:
+        return warnings
+    policy = PathPolicy.from_contract(contract)
+    hint_paths = scenario.get("workspaceHints", {}).get("paths", [])
+    for p in hint_paths:
+        reasons = policy.violations(p)
+        if "forbidden" in reasons:
+            warnings.append(f"{path}: workspace hint '{p}' overlaps forbiddenPaths")
+        if "not-allowed" in reasons:
+            warnings.append(f"{path}: workspace hint '{p}' not covered by allowedPaths")
+    return warnings
+
+
+def validate_scenario(
+    path: Path,
+    scenario: dict,
+    data: EcosystemData,
+    validator: Draft202012Validator,
+    validate_outputs: bool = False,
+) -> ScenarioResult:
+    result = ScenarioResult(path=path, scenario=scenario)
+    result.errors.extend(validate_against_schema(scenario, validator, path))
+    result.errors.extend(
+        validate_cross_references(
+            scenario, data.agents, data.toolsets, data.contracts, data.circuits, path
+        )
+    )
+
+    contract = data.contracts.get(scenario.get("agentId"))
+    if not result.errors:
+        result.warnings.extend(check_contract_warnings(scenario, contract, path))
+
+    if validate_outputs and not result.errors and contract:
+        output_validator = structured_output_validator(
+            contract.get("structuredOutputSchema")
+        )
+        result.errors.extend(
+            validate_output_fixture(scenario.get("id"), contract, output_validator)
+        )
+    return result
+
+
+def validate_scenario_file(
+    path: Path,
+    data: EcosystemData,
+    validator: Draft202012Validator,
+    validate_outputs: bool = False,
+) -> ScenarioResult:
+    scenario = yaml.safe_load(path.read_text(encoding="utf-8"))
+    return validate_scenario(path, scenario, data, validator, validate_outputs)
+
+
+# Read-only inputs shipped to each pool worker once, not once per scenario;
+# each worker compiles the scenario schema itself from its own registry.
+_worker_state: Optional[Tuple[EcosystemData, Draft202012Validator, bool]] = None
+
+
+def _init_scenario_worker(data: EcosystemData, validate_outputs: bool) -> None:
+    global _worker_state
+    _worker_state = (data, scenario_validator(), validate_outputs)
+
+
+def _validate_in_worker(path: Path) -> ScenarioResult:
+    data, validator, validate_outputs = _worker_state
+    return validate_scenario_file(path, data, validator, validate_outputs)
+
+
+def _reference_dependency(data: EcosystemData, kind: str, item_id: object) -> str:
+    path = data.source_path(kind, item_id)
+    if path is None:
+        # Unresolved reference: the verdict only changes when a file is added.
+        return f"{cache_name(ECOSYSTEM_ROOT / kind)}/{SOURCE_GLOBS[kind]}"
+    return cache_name(path)
+
+
+def scenario_dependencies(
+    scenario: dict, data: EcosystemData, validate_outputs: bool = False
+) -> List[str]:
+    """Files (or globs, for unresolved ids) outside the scenario YAML that
+    validate_scenario reads: the agent, its toolsets, the agent's contract,
+    the circuit and, with validate_outputs, the structured-output schema and
+    fixture. The scenario schema is part of the cache rule-set instead.
+    """
+    agent_id = scenario.get("agentId")
+    deps = [_reference_dependency(data, "agents", agent_id)]
+    deps.extend(
+        _reference_dependency(data, "toolsets", ts)
+        for ts in scenario.get("toolsets", [])
+    )
+    deps.append(_reference_dependency(data, "contracts", agent_id))
+    circuit_id = scenario.get("circuitId")
+    if circuit_id:
+        deps.append(_reference_dependency(data, "circuits", circuit_id))
+    contract = data.contracts.get(agent_id)
+    if validate_outputs and contract:
+        schema_path = contract.get("structuredOutputSchema")
+        if schema_path:
+            deps.append(cache_name(ROOT / schema_path))
+        deps.append(cache_name(OUTPUT_FIXTURE_DIR / f"{scenario.get('id')}.json"))
+    return sorted(set(deps))
+
+
+def _scenario_entry(path: Path, validate_outputs: bool) -> str:
+    """Cache entry name: one per scenario file and validation mode, so runs
+    with and without validate_outputs keep separate results."""
+    name = cache_name(path)
+    return f"{name}#outputs" if validate_outputs else name
+
+
+def validate_scenarios(
+    data: EcosystemData,
+    validate_outputs: bool = False,
+    jobs: int = 1,
+    cache: ValidationCache | None = None,
+    changed_only: bool = False,
+) -> ScenarioReport:
+    """Validate every scenario YAML against the schema and cross-references.
+
+    With jobs > 1 scenarios are validated in a process pool; results keep
+    the sorted path order either way. With a cache, each result is stored
+    with its scenario_dependencies() and reused while the scenario file and
+    every dependency hash the same. changed_only (requires a cache) reports
+    just the revalidated scenarios in `results`; the rest go to `skipped`,
+    so cached failures are still reported as errors.
+    """
+    if changed_only and cache is None:
+        raise ValueError("changed_only needs a validation cache")
+    paths = sorted(SCENARIO_DIR.glob("*.yaml"))
+    results: Dict[Path, ScenarioResult] = {}
+    keys: Dict[Path, str] = {}
+    pending: List[Path] = []
+
+    for path in paths:
+        if cache is not None:
+            keys[path] = cache.key(path)
+            cached = cache.lookup(_scenario_entry(path, validate_outputs), keys[path])
+            if cached is not None:
+                results[path] = ScenarioResult(
+                    path=path,
+                    scenario=cached["scenario"],
+                    errors=list(cached["errors"]),
+                    warnings=list(cached["warnings"]),
+                )
+                continue
+        pending.append(path)
+
+    if jobs <= 1 or len(pending) <= 1:
+        validator = scenario_validator() if pending else None
+        fresh = [
+            validate_scenario_file(path, data, validator, validate_outputs)
+            for path in pending
+        ]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=_init_scenario_worker,
+            initargs=(data, validate_outputs),
+        ) as pool:
+            chunksize = max(1, len(pending) // (jobs * 4))
+            fresh = list(pool.map(_validate_in_worker, pending, chunksize=chunksize))
+
+    for result in fresh:
+        results[result.path] = result
+        if cache is not None:
+            cache.store(
+                _scenario_entry(result.path, validate_outputs),
+                keys[result.path],
+                {
+                    "scenario": result.scenario,
+                    "errors": result.errors,
+                    "warnings": result.warnings,
+                },
+                deps=dependency_map(
+                    scenario_dependencies(result.scenario, data, validate_outputs)
+                ),
+            )
+    if cache is not None:
+        cache.prune(
+            _scenario_entry(path, mode) for path in paths for mode in (False, True)
+        )
+    if changed_only:
+        fresh_paths = set(pending)
+        return ScenarioReport(
+            results=[results[path] for path in pending],
+            skipped=[results[path] for path in paths if path not in fresh_paths],
+        )
+    return ScenarioReport(results=[results[path] for path in paths])
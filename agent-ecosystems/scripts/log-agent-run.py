@@ -3,17 +3,15 @@
 
 Usage:
   python3 agent-ecosystems/scripts/log-agent-run.py --agent <id> --stack <id> --status <status> [--scenario <id>] [--circuit <id>] [--tool-calls N] [--duration-ms N]
+
+Scripts that log many runs should use run_log.RunLogger directly instead of
+invoking this once per entry.
 """
 from __future__ import annotations
 
 import argparse
-import json
-from datetime import datetime, timezone
-from pathlib import Path
 
-ROOT = Path(__file__).resolve().parents[2]
-LOG_DIR = ROOT / "agent-ecosystems" / "logs" / "runs"
-LOG_PATH = LOG_DIR / "runs.jsonl"
+from run_log import LOG_PATH, RunLogger
 
 
 def main() -> int:
@@ -27,19 +25,16 @@ def main() -> int:
     parser.add_argument("--duration-ms", type=int, default=0)
     args = parser.parse_args()
 
-    LOG_DIR.mkdir(parents=True, exist_ok=True)
-    entry = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "agentId": args.agent,
-        "stackId": args.stack,
-        "scenarioId": args.scenario,
-        "circuitId": args.circuit,
-        "status": args.status,
-        "toolCalls": args.tool_calls,
-        "durationMs": args.duration_ms,
-    }
-    with LOG_PATH.open("a", encoding="utf-8") as f:
-        f.write(json.dumps(entry) + "\n")
+    with RunLogger(LOG_PATH) as logger:
+        logger.log(
+            args.agent,
+            args.stack,
+            args.status,
+            scenario=args.scenario,
+            circuit=args.circuit,
+            tool_calls=args.tool_calls,
+            duration_ms=args.duration_ms,
+        )
     return 0
 
 
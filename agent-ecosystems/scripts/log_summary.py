@@ -0,0 +1,386 @@
+"""Streaming aggregation of agent run logs (agent-ecosystems/logs/runs/*.jsonl).
+
+scan_file() reads a log file line by line through a buffered reader and
+LogSummary folds the parsed entries into counters keyed by agent,
+scenario and status, plus a QuantileSketch of durationMs per agent,
+scenario, circuit and stack for p50/p90/p95/p99/max. Nothing holds on to
+individual entries, so memory is bounded by the number of distinct keys
+rather than by log size. Summaries of different files (or hosts) can be
+combined with merge(); merged sketches equal those of the combined logs.
+
+SummaryState makes repeated summaries incremental. It keeps one partial
+LogSummary per log file, together with a checkpoint: the byte offset of the
+last complete line read, plus the file's inode, size and a digest of its
+first bytes. refresh() reads only the lines appended since the checkpoint.
+A last line without a trailing newline is counted if it parses, but is kept
+outside the checkpointed prefix and re-read once more bytes arrive; full
+scans (summarise_files) go through the same scanner, so both agree.
+A file whose inode changed, or that shrank below its offset, or whose head
+bytes differ (truncated, rotated or rewritten), is rescanned from byte 0.
+Files that are gone are dropped. The total is the merge of the per-file
+partials, in file order, so it matches a full rescan exactly. The state is
+kept in dist/cache/log-summary-state.json.
+
+Files are the unit of parallelism: with jobs > 1, summarise_files() and
+SummaryState.refresh() scan files (shards, e.g. one per CI runner) in a
+process pool, each worker returning a partial summary that the parent
+merges in file order, so the report does not depend on `jobs`.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import math
+import os
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterable, List, Optional, Tuple
+
+from quantile_sketch import QuantileSketch
+from run_log import LOG_DIR, ROOT
+
+READ_BUFFER = 1024 * 1024
+SUMMARY_STATE_PATH = ROOT / "dist" / "cache" / "log-summary-state.json"
+# Bump when the state layout changes so old state files are ignored.
+SUMMARY_STATE_FORMAT = 3
+# Bytes at the start of a log compared to detect rotation/rewrites.
+HEAD_BYTES = 4096
+# Entry field per latency dimension reported by LogSummary.
+LATENCY_DIMENSIONS = {
+    "agent": "agentId",
+    "scenario": "scenarioId",
+    "circuit": "circuitId",
+    "stack": "stackId",
+}
+PERCENTILES = (0.5, 0.9, 0.95, 0.99)
+
+
+def log_files(log_dir: Path = LOG_DIR) -> List[Path]:
+    if not log_dir.exists():
+        return []
+    return sorted(log_dir.glob("*.jsonl"))
+
+
+def parse_line(line: bytes) -> Optional[dict]:
+    """The entry on one log line, or None if it is malformed.
+
+    json accepts Infinity/NaN, so a non-finite durationMs counts as malformed.
+    """
+    try:
+        entry = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(entry, dict):
+        return None
+    duration = entry.get("durationMs")
+    if isinstance(duration, float) and not math.isfinite(duration):
+        return None
+    return entry
+
+
+def _duration(entry: dict) -> float:
+    value = entry.get("durationMs", 0)
+    return float(value) if isinstance(value, (int, float)) else 0.0
+
+
+@dataclass
+class LogSummary:
+    """Counters (and duration stats) over any number of run log entries."""
+
+    entries: int = 0
+    by_agent: Counter = field(default_factory=Counter)
+    by_scenario: Counter = field(default_factory=Counter)
+    statuses: Counter = field(default_factory=Counter)
+    # dimension (see LATENCY_DIMENSIONS) -> key -> durationMs sketch
+    latency: Dict[str, Dict[str, QuantileSketch]] = field(
+        default_factory=lambda: {dim: {} for dim in LATENCY_DIMENSIONS}
+    )
+
+    def add(self, entry: dict) -> None:
+        self.entries += 1
+        self.by_agent[entry.get("agentId")] += 1
+        if entry.get("scenarioId"):
+            self.by_scenario[entry["scenarioId"]] += 1
+        self.statuses[entry.get("status")] += 1
+        duration = _duration(entry)
+        for dim, key_field in LATENCY_DIMENSIONS.items():
+            key = entry.get(key_field)
+            # Every entry counts towards its agent; the other dimensions are optional.
+            if key or dim == "agent":
+                sketches = self.latency[dim]
+                sketch = sketches.get(key)
+                if sketch is None:
+                    sketch = sketches[key] = QuantileSketch()
+                sketch.add(duration)
+
+    def update(self, entries: Iterable[dict]) -> "LogSummary":
+        for entry in entries:
+            self.add(entry)
+        return self
+
+    def merge(self, other: "LogSummary") -> "LogSummary":
+        self.entries += other.entries
+        self.by_agent.update(other.by_agent)
+        self.by_scenario.update(other.by_scenario)
+        self.statuses.update(other.statuses)
+        for dim, sketches in other.latency.items():
+            mine = self.latency.setdefault(dim, {})
+            for key, sketch in sketches.items():
+                if key in mine:
+                    mine[key].merge(sketch)
+                else:
+                    mine[key] = QuantileSketch().merge(sketch)
+        return self
+
+    def to_json(self) -> dict:
+        # Counters are stored as [key, count] pairs to keep insertion order
+        # and non-string keys (e.g. a missing agentId) intact.
+        return {
+            "entries": self.entries,
+            "byAgent": list(self.by_agent.items()),
+            "byScenario": list(self.by_scenario.items()),
+            "statuses": list(self.statuses.items()),
+            "latency": {
+                dim: [[key, sketch.to_json()] for key, sketch in sketches.items()]
+                for dim, sketches in self.latency.items()
+            },
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "LogSummary":
+        summary = cls(
+            entries=data["entries"],
+            by_agent=Counter(dict(data["byAgent"])),
+            by_scenario=Counter(dict(data["byScenario"])),
+            statuses=Counter(dict(data["statuses"])),
+        )
+        for dim, sketches in data["latency"].items():
+            summary.latency[dim] = {
+                key: QuantileSketch.from_json(sketch) for key, sketch in sketches
+            }
+        return summary
+
+    def report(self) -> str:
+        lines = ["Runs per agent:"]
+        agent_latency = self.latency.get("agent", {})
+        for agent, count in self.by_agent.items():
+            avg = agent_latency[agent].mean if agent in agent_latency else 0
+            lines.append(f"- {agent}: {count} runs (avg duration {avg:.1f} ms)")
+
+        lines.append("\nRuns per scenario:")
+        for scen, count in self.by_scenario.items():
+            lines.append(f"- {scen}: {count} runs")
+
+        lines.append("\nStatuses:")
+        for status, count in self.statuses.items():
+            lines.append(f"- {status}: {count}")
+
+        for dim in LATENCY_DIMENSIONS:
+            sketches = self.latency.get(dim, {})
+            if not sketches:
+                continue
+            lines.append(f"\nLatency per {dim} (durationMs):")
+            lines.append(f"{dim.upper()} | RUNS | P50 | P90 | P95 | P99 | MAX")
+            for key, sketch in sketches.items():
+                cells = [f"{sketch.quantile(q):.1f}" for q in PERCENTILES]
+                lines.append(
+                    f"{key} | {sketch.count} | {' | '.join(cells)} | {sketch.max:.1f}"
+                )
+        return "\n".join(lines)
+
+
+def summarise_files(paths: Iterable[Path], jobs: int = 1) -> LogSummary:
+    """Summary of all `paths`; with jobs > 1 files are scanned in parallel."""
+    total = LogSummary()
+    for checkpoint in _scan_files([(p, None) for p in paths], jobs):
+        checkpoint.add_to(total)
+    return total
+
+
+def _head_digest(handle: BinaryIO, length: int) -> str:
+    handle.seek(0)
+    return hashlib.sha256(handle.read(min(length, HEAD_BYTES))).hexdigest()
+
+
+@dataclass
+class FileCheckpoint:
+    """How far one log file has been read, and the summary of that prefix."""
+
+    inode: int = 0
+    size: int = 0
+    mtime_ns: int = 0
+    offset: int = 0
+    head: str = ""
+    summary: LogSummary = field(default_factory=LogSummary)
+    # Entry on an unterminated last line: counted, but not part of `offset`.
+    tail: Optional[dict] = None
+
+    def add_to(self, total: LogSummary) -> None:
+        total.merge(self.summary)
+        if self.tail is not None:
+            total.add(self.tail)
+
+    def to_json(self) -> dict:
+        return {
+            "inode": self.inode,
+            "size": self.size,
+            "mtimeNs": self.mtime_ns,
+            "offset": self.offset,
+            "head": self.head,
+            "summary": self.summary.to_json(),
+            "tail": self.tail,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "FileCheckpoint":
+        return cls(
+            inode=data["inode"],
+            size=data["size"],
+            mtime_ns=data["mtimeNs"],
+            offset=data["offset"],
+            head=data["head"],
+            summary=LogSummary.from_json(data["summary"]),
+            tail=data["tail"],
+        )
+
+    def unchanged(self, stat: os.stat_result) -> bool:
+        """True if the file still has the inode, size and mtime last read."""
+        return (self.inode, self.size, self.mtime_ns) == (
+            stat.st_ino,
+            stat.st_size,
+            stat.st_mtime_ns,
+        )
+
+
+def scan_file(path: Path, checkpoint: Optional[FileCheckpoint] = None) -> FileCheckpoint:
+    """Fold the complete lines of `path` past `checkpoint` into its summary.
+
+    An unterminated last line is parsed into `tail` (if valid) without
+    advancing the offset, so it is read again, whole, on the next scan.
+
+    An existing checkpoint is updated in place; a fresh one is returned when
+    there was none or the file was rotated or truncated.
+    """
+    stat = path.stat()
+    if checkpoint is not None and checkpoint.unchanged(stat):
+        return checkpoint
+    with path.open("rb", buffering=READ_BUFFER) as handle:
+        if checkpoint is not None and (
+            checkpoint.inode != stat.st_ino
+            or stat.st_size < checkpoint.offset
+            or _head_digest(handle, checkpoint.offset) != checkpoint.head
+        ):
+            checkpoint = None
+        if checkpoint is None:
+            checkpoint = FileCheckpoint(inode=stat.st_ino)
+        handle.seek(checkpoint.offset)
+        offset = checkpoint.offset
+        checkpoint.tail = None
+        for line in handle:
+            if not line.endswith(b"\n"):
+                checkpoint.tail = parse_line(line)
+                break
+            offset += len(line)
+            entry = parse_line(line)
+            if entry is not None:
+                checkpoint.summary.add(entry)
+        checkpoint.size = stat.st_size
+        checkpoint.mtime_ns = stat.st_mtime_ns
+        checkpoint.offset = offset
+        checkpoint.head = _head_digest(handle, offset)
+    return checkpoint
+
+
+FileScan = Tuple[Path, Optional[FileCheckpoint]]
+
+
+def _scan_in_worker(scan: FileScan) -> FileCheckpoint:
+    return scan_file(*scan)
+
+
+def _scan_files(scans: List[FileScan], jobs: int) -> List[FileCheckpoint]:
+    """scan_file() for every (path, checkpoint), in order, in up to `jobs` processes."""
+    if jobs <= 1 or len(scans) <= 1:
+        return [scan_file(*scan) for scan in scans]
+    with ProcessPoolExecutor(max_workers=min(jobs, len(scans))) as pool:
+        chunksize = max(1, len(scans) // (jobs * 4))
+        return list(pool.map(_scan_in_worker, scans, chunksize=chunksize))
+
+
+class SummaryState:
+    """Per-file checkpoints persisted between summarise-logs runs."""
+
+    def __init__(
+        self,
+        files: Optional[Dict[str, FileCheckpoint]] = None,
+        path: Path = SUMMARY_STATE_PATH,
+    ):
+        self.files: Dict[str, FileCheckpoint] = files or {}
+        self.path = path
+        self.scanned = 0
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: Path = SUMMARY_STATE_PATH) -> "SummaryState":
+        """Saved state, or an empty one if it is missing, unreadable or outdated."""
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+            if data.get("format") != SUMMARY_STATE_FORMAT:
+                return cls(path=path)
+            files = {
+                name: FileCheckpoint.from_json(entry)
+                for name, entry in data.get("files", {}).items()
+            }
+        except (OSError, ValueError, KeyError, TypeError):
+            return cls(path=path)
+        return cls(files, path)
+
+    def refresh(self, paths: Iterable[Path], jobs: int = 1) -> LogSummary:
+        """Bring every file in `paths` up to date and return the total summary.
+
+        Files whose inode, size and mtime match their checkpoint are not
+        opened; the rest are scanned (in `jobs` worker processes if > 1).
+        """
+        paths = list(paths)
+        names = [str(p.resolve()) for p in paths]
+        for name in [n for n in self.files if n not in set(names)]:
+            del self.files[name]
+            self._dirty = True
+        pending: List[str] = []
+        scans: List[FileScan] = []
+        for path, name in zip(paths, names, strict=True):
+            previous = self.files.get(name)
+            if previous is None or not previous.unchanged(path.stat()):
+                pending.append(name)
+                scans.append((path, previous))
+        for name, checkpoint in zip(pending, _scan_files(scans, jobs), strict=True):
+            self.files[name] = checkpoint
+        if pending:
+            self.scanned += len(pending)
+            self._dirty = True
+        total = LogSummary()
+        for name in names:
+            self.files[name].add_to(total)
+        return total
+
+    def save(self) -> None:
+        """Write the state file if anything changed (atomic replace)."""
+        if not self._dirty:
+            return
+        payload = {
+            "format": SUMMARY_STATE_FORMAT,
+            "files": {name: cp.to_json() for name, cp in self.files.items()},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, separators=(",", ":"))
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._dirty = False
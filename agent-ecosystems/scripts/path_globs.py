@@ -0,0 +1,207 @@
+"""Compiled matchers for contract path globs (allowedPaths/forbiddenPaths).
+
+Glob semantics (repo-relative POSIX paths, case-sensitive):
+
+- `*` matches any run of characters within one path segment, `?` one
+  character, `[...]` a character class (`[!...]` negates); none of them
+  matches "/".
+- `**` as a whole segment matches zero or more segments, so `docs/**`
+  matches `docs`, `docs/a` and `docs/a/b`, and `**/tmp` matches `tmp` and
+  `a/b/tmp`. Inside a segment (`a**b`) it behaves like `*`.
+- A pattern without wildcards matches exactly that path.
+
+Paths and patterns are normalised first: `./` prefixes, empty segments and
+trailing slashes are ignored, so the directory hint `docs/` is `docs`.
+
+PathMatcher stores patterns in a trie keyed by their leading literal
+segments; each node holds one combined regex for the wildcard remainders of
+the patterns ending there. Matching a path walks its segments down the trie
+and runs at most one regex per visited node, so the cost depends on the
+path's depth rather than on the number of patterns.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+_WILDCARD_CHARS = frozenset("*?[")
+
+
+def split_path(path: str) -> List[str]:
+    """Normalise a repo-relative path (or pattern) into its segments."""
+    return [seg for seg in path.replace("\\", "/").split("/") if seg not in {"", "."}]
+
+
+def _segment_regex(segment: str) -> str:
+    """Translate one glob segment (no "/") to a regex; mirrors fnmatch."""
+    out: List[str] = []
+    i, n = 0, len(segment)
+    while i < n:
+        ch = segment[i]
+        i += 1
+        if ch == "*":
+            while i < n and segment[i] == "*":
+                i += 1
+            out.append("[^/]*")
+        elif ch == "?":
+            out.append("[^/]")
+        elif ch == "[":
+            j = i
+            if j < n and segment[j] == "!":
+                j += 1
+            if j < n and segment[j] == "]":
+                j += 1
+            while j < n and segment[j] != "]":
+                j += 1
+            if j >= n:
+                out.append(re.escape(ch))
+                continue
+            body = segment[i:j].replace("\\", "\\\\")
+            i = j + 1
+            if body.startswith("!"):
+                body = "^" + body[1:]
+            elif body.startswith("^"):
+                body = "\\" + body
+            # Classes stay within one segment: neither `[!x]` nor a range
+            # such as `[+-0]` may match the separator.
+            out.append(f"(?!/)[{body}]")
+        else:
+            out.append(re.escape(ch))
+    return "".join(out)
+
+
+def _remainder_regex(segments: List[str]) -> str:
+    """Regex for the rest of a path written as "/seg1/seg2..." ("" if none)."""
+    parts: List[str] = []
+    for seg in segments:
+        if seg == "**":
+            parts.append("(?:/[^/]+)*")
+        else:
+            parts.append("/" + _segment_regex(seg))
+    return "".join(parts)
+
+
+def _normalise_pattern(pattern: str) -> List[str]:
+    segments: List[str] = []
+    for seg in split_path(pattern):
+        if seg == "**" and segments and segments[-1] == "**":
+            continue
+        segments.append(seg)
+    return segments
+
+
+class _Node:
+    __slots__ = ("children", "remainders", "regex")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, _Node] = {}
+        # (regex source, pattern index) for patterns whose literal prefix ends here.
+        self.remainders: List[Tuple[str, int]] = []
+        self.regex: Optional[Pattern[str]] = None
+
+
+class PathMatcher:
+    """Match paths against a fixed list of globs (see module docstring)."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns: Tuple[str, ...] = tuple(patterns)
+        self._root = _Node()
+        for index, pattern in enumerate(self.patterns):
+            segments = _normalise_pattern(pattern)
+            node = self._root
+            depth = 0
+            while depth < len(segments) and not (
+                _WILDCARD_CHARS & set(segments[depth])
+            ):
+                node = node.children.setdefault(segments[depth], _Node())
+                depth += 1
+            node.remainders.append((_remainder_regex(segments[depth:]), index))
+        self._compile(self._root)
+
+    def _compile(self, node: _Node) -> None:
+        if node.remainders:
+            # Named groups tell us which pattern matched.
+            node.regex = re.compile(
+                "|".join(f"(?P<p{index}>{rx})" for rx, index in node.remainders)
+            )
+        for child in node.children.values():
+            self._compile(child)
+
+    def match(self, path: str) -> Optional[str]:
+        """Return a pattern that matches `path` (shallowest trie node first), or None."""
+        segments = split_path(path)
+        rest = "".join("/" + seg for seg in segments)
+        offset = 0
+        node: Optional[_Node] = self._root
+        depth = 0
+        while node is not None:
+            if node.regex is not None:
+                m = node.regex.fullmatch(rest, offset)
+                if m:
+                    return self.patterns[int(m.lastgroup[1:])]
+            if depth == len(segments):
+                break
+            offset += len(segments[depth]) + 1
+            node = node.children.get(segments[depth])
+            depth += 1
+        return None
+
+    def matches(self, path: str) -> bool:
+        return self.match(path) is not None
+
+    def filter(self, paths: Iterable[str]) -> List[str]:
+        """The paths that match any pattern, in input order."""
+        return [path for path in paths if self.match(path) is not None]
+
+    def __bool__(self) -> bool:
+        return bool(self.patterns)
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+
+@lru_cache(maxsize=256)
+def compile_globs(patterns: Tuple[str, ...]) -> PathMatcher:
+    """Shared PathMatcher per pattern tuple (contracts are checked repeatedly)."""
+    return PathMatcher(patterns)
+
+
+@dataclass(frozen=True)
+class PathPolicy:
+    """A contract's allowedPaths/forbiddenPaths as compiled matchers.
+
+    An empty allowedPaths list allows everything not forbidden.
+    """
+
+    allowed: PathMatcher
+    forbidden: PathMatcher
+
+    @classmethod
+    def from_contract(cls, contract: dict) -> "PathPolicy":
+        return cls(
+            allowed=compile_globs(tuple(contract.get("allowedPaths") or ())),
+            forbidden=compile_globs(tuple(contract.get("forbiddenPaths") or ())),
+        )
+
+    def violations(self, path: str) -> List[str]:
+        """Reasons `path` breaks the policy: "forbidden" and/or "not-allowed"."""
+        reasons: List[str] = []
+        if self.forbidden and self.forbidden.matches(path):
+            reasons.append("forbidden")
+        if self.allowed and not self.allowed.matches(path):
+            reasons.append("not-allowed")
+        return reasons
+
+    def permits(self, path: str) -> bool:
+        return not self.violations(path)
+
+    def check(self, paths: Iterable[str]) -> Dict[str, List[str]]:
+        """{path: reasons} for every path in `paths` that violates the policy."""
+        result: Dict[str, List[str]] = {}
+        for path in paths:
+            reasons = self.violations(path)
+            if reasons:
+                result[path] = reasons
+        return result
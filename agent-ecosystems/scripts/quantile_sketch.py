@@ -0,0 +1,131 @@
+"""Mergeable streaming quantile sketch for latency percentiles.
+
+QuantileSketch is a DDSketch-style histogram: each value v > 0 is counted in
+bucket ceil(log_gamma(v)) with gamma = (1 + a) / (1 - a), so any quantile is
+returned within relative error `a` (1% by default) of a true sample value.
+Memory is one counter per occupied bucket; 1 ms to 1 day needs about 900
+at 1%. Merging two sketches adds bucket counts, so the result is exactly
+the sketch of the combined stream, whatever the order or sharding. With
+more than `max_buckets` buckets the lowest ones are folded together, which
+keeps memory fixed and only affects the smallest values.
+
+Values <= 0 (e.g. "durationMs": 0 from static runs) are counted exactly in
+a separate zero bucket. Non-finite values (inf, nan) are rejected.
+"""
+from __future__ import annotations
+
+import math
+from typing import Dict, Optional
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+DEFAULT_MAX_BUCKETS = 2048
+
+
+class QuantileSketch:
+    def __init__(
+        self,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+        max_buckets: int = DEFAULT_MAX_BUCKETS,
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be in (0, 1)")
+        self.relative_accuracy = relative_accuracy
+        self.max_buckets = max_buckets
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        # Midpoint (in relative terms) of bucket (gamma^(key-1), gamma^key].
+        return 2 * self.gamma**key / (self.gamma + 1)
+
+    def add(self, value: float) -> None:
+        if not math.isfinite(value):
+            raise ValueError(f"Cannot add non-finite value to a sketch: {value}")
+        if value > 0:
+            key = self._key(value)
+            self.buckets[key] = self.buckets.get(key, 0) + 1
+            if len(self.buckets) > self.max_buckets:
+                self._collapse()
+        else:
+            self.zero_count += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+
+    def _collapse(self) -> None:
+        keys = sorted(self.buckets)
+        excess = len(keys) - self.max_buckets
+        target = keys[excess]
+        for key in keys[:excess]:
+            self.buckets[target] += self.buckets.pop(key)
+
+    def merge(self, other: "QuantileSketch") -> "QuantileSketch":
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        if len(self.buckets) > self.max_buckets:
+            self._collapse()
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+        for bound in (other.min, other.max):
+            if bound is not None:
+                self.min = bound if self.min is None else min(self.min, bound)
+                self.max = bound if self.max is None else max(self.max, bound)
+        return self
+
+    def quantile(self, q: float) -> float:
+        """Estimated q-quantile (0 <= q <= 1); 0.0 for an empty sketch."""
+        if not 0 <= q <= 1:
+            raise ValueError("q must be in [0, 1]")
+        if not self.count:
+            return 0.0
+        if q == 1:
+            return float(self.max)
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return float(min(self.min, 0.0))
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return min(max(self._value(key), self.min), self.max)
+        return float(self.max)
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def to_json(self) -> dict:
+        return {
+            "relativeAccuracy": self.relative_accuracy,
+            "maxBuckets": self.max_buckets,
+            "buckets": [[key, count] for key, count in sorted(self.buckets.items())],
+            "zeroCount": self.zero_count,
+            "count": self.count,
+            "total": self.total,
+            "min": self.min,
+            "max": self.max,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "QuantileSketch":
+        sketch = cls(data["relativeAccuracy"], data["maxBuckets"])
+        sketch.buckets = {int(key): int(count) for key, count in data["buckets"]}
+        sketch.zero_count = data["zeroCount"]
+        sketch.count = data["count"]
+        sketch.total = data["total"]
+        sketch.min = data["min"]
+        sketch.max = data["max"]
+        return sketch
@@ -4,167 +4,37 @@
 - Loads agents, toolsets, stacks.
 - Validates scenario YAML files against schema and cross-references agent/toolset IDs.
 - Writes markdown checklists to agent-ecosystems/tests/output/ (unless --no-output).
+- Optionally validates scenarios in parallel worker processes (--jobs N).
+- Reuses cached results for unchanged scenarios (see validation_cache;
+  --no-cache or NO_VALIDATION_CACHE=1 revalidates everything). Each result
+  records the files it depends on (agent, toolsets, contract, circuit,
+  output schema/fixture); --changed reports only the scenarios whose file
+  or dependencies hash differently since they were last validated.
+- Optionally executes each valid scenario (--execute) through an agent
+  backend (scenario_harness; a deterministic stub by default), recording
+  real latency, tool calls and structured outputs checked against the
+  contract schema. Runs are written as <scenario>.run.json next to the
+  checklists and, with --log-runs, logged with their measured metrics.
+
+The validation itself lives in ecosystem_validation.validate_scenarios.
 """
 from __future__ import annotations
 
 import argparse
-import fnmatch
 import json
 import sys
-from datetime import datetime, timezone
-from pathlib import Path
-from typing import Dict, List
+from typing import List
 
-import yaml
-from jsonschema import Draft202012Validator
+from ecosystem_validation import (
+    TEST_ROOT,
+    EcosystemData,
+    open_scenario_cache,
+    validate_scenarios,
+)
+from run_log import LOG_PATH, RunLogger
+from scenario_harness import ScenarioRun, execute_scenario, load_backend
 
-ROOT = Path(__file__).resolve().parents[2]
-ECOSYSTEM_ROOT = ROOT / "agent-ecosystems"
-TEST_ROOT = ECOSYSTEM_ROOT / "tests"
-SCENARIO_DIR = TEST_ROOT / "scenarios"
 OUTPUT_DIR = TEST_ROOT / "output"
-SCHEMA_PATH = TEST_ROOT / "scenario.schema.yaml"
-CONTRACT_DIR = ECOSYSTEM_ROOT / "contracts"
-OUTPUT_FIXTURE_DIR = TEST_ROOT / "output-fixtures"
-STRUCTURED_SCHEMA_DIR = ECOSYSTEM_ROOT / "schemas" / "structured-outputs"
-CIRCUIT_DIR = ECOSYSTEM_ROOT / "circuits"
-LOG_SCRIPT = ECOSYSTEM_ROOT / "scripts" / "log-agent-run.py"
-
-
-def load_json_from_path(path: Path) -> dict:
-    return json.loads(path.read_text(encoding="utf-8"))
-
-
-def load_json_files(directory: Path) -> Dict[str, dict]:
-    items: Dict[str, dict] = {}
-    for path in sorted(directory.glob("*.json")):
-        data = load_json_from_path(path)
-        items[data["id"]] = data
-    return items
-
-
-def load_schema() -> dict:
-    if not SCHEMA_PATH.exists():
-        raise FileNotFoundError(f"Missing scenario schema: {SCHEMA_PATH}")
-    return yaml.safe_load(SCHEMA_PATH.read_text(encoding="utf-8"))
-
-
-def load_contracts() -> Dict[str, dict]:
-    contracts: Dict[str, dict] = {}
-    if not CONTRACT_DIR.exists():
-        return contracts
-    for path in sorted(CONTRACT_DIR.glob("*.contract.json")):
-        data = load_json_from_path(path)
-        contracts[data.get("id")] = data
-    return contracts
-
-
-def load_structured_schema(schema_path: str | None) -> dict | None:
-    if not schema_path:
-        return None
-    path = ROOT / schema_path
-    if not path.exists():
-        raise FileNotFoundError(f"Structured output schema missing: {path}")
-    return load_json_from_path(path)
-
-
-def load_circuits() -> Dict[str, dict]:
-    circuits: Dict[str, dict] = {}
-    if not CIRCUIT_DIR.exists():
-        return circuits
-    for path in sorted(CIRCUIT_DIR.glob("*.circuit.yaml")):
-        data = yaml.safe_load(path.read_text(encoding="utf-8"))
-        circuits[data.get("id")] = data
-    return circuits
-
-
-def validate_output_fixture(
-    scenario_id: str, contract: dict, schema: dict | None
-) -> List[str]:
-    errors: List[str] = []
-    if not schema:
-        return errors
-    fixture_path = OUTPUT_FIXTURE_DIR / f"{scenario_id}.json"
-    if not fixture_path.exists():
-        errors.append(f"Fixture missing for structured output: {fixture_path}")
-        return errors
-    fixture = load_json_from_path(fixture_path)
-    validator = Draft202012Validator(schema)
-    for err in validator.iter_errors(fixture):
-        location = "/".join(str(p) for p in err.path) or "<root>"
-        errors.append(f"{fixture_path}: {location}: {err.message}")
-    return errors
-
-
-def validate_against_schema(instance: dict, schema: dict, path: Path) -> List[str]:
-    errors: List[str] = []
-    validator = Draft202012Validator(schema)
-    for err in validator.iter_errors(instance):
-        location = "/".join(str(p) for p in err.path) or "<root>"
-        errors.append(f"{path}: {location}: {err.message}")
-    return errors
-
-
-def validate_cross_references(
-    scenario: dict,
-    agents: Dict[str, dict],
-    toolsets: Dict[str, dict],
-    contracts: Dict[str, dict],
-    circuits: Dict[str, dict],
-    path: Path,
-) -> List[str]:
-    errors: List[str] = []
-    agent_id = scenario.get("agentId")
-    if agent_id not in agents:
-        errors.append(f"{path}: agentId '{agent_id}' not found in agents/")
-    else:
-        agent_toolsets = set(agents[agent_id].get("toolsets", []))
-        for ts in scenario.get("toolsets", []):
-            if ts not in toolsets:
-                errors.append(f"{path}: toolset '{ts}' not found in toolsets/")
-            if ts not in agent_toolsets:
-                errors.append(
-                    f"{path}: toolset '{ts}' not listed on agent '{agent_id}'"
-                )
-        if contracts and agent_id not in contracts:
-            errors.append(f"{path}: contract missing for agent '{agent_id}'")
-        elif contracts and agent_id in contracts:
-            contract_toolsets = set(contracts[agent_id].get("toolsets", []))
-            for ts in scenario.get("toolsets", []):
-                if ts not in contract_toolsets:
-                    errors.append(
-                        f"{path}: toolset '{ts}' not allowed by contract for '{agent_id}'"
-                    )
-    circuit_id = scenario.get("circuitId")
-    if circuit_id:
-        if circuit_id not in circuits:
-            errors.append(f"{path}: circuitId '{circuit_id}' not found")
-        else:
-            circuit_agents = {
-                a.get("id") for a in circuits[circuit_id].get("agents", [])
-            }
-            if agent_id not in circuit_agents:
-                errors.append(
-                    f"{path}: circuitId '{circuit_id}' does not include agent '{agent_id}'"
-                )
-    return errors
-
-
-def check_contract_warnings(
-    scenario: dict, contract: dict | None, path: Path
-) -> List[str]:
-    warnings: List[str] = []
-    if not contract:
-        return warnings
-    allowed = contract.get("allowedPaths", [])
-    forbidden = contract.get("forbiddenPaths", [])
-    hint_paths = scenario.get("workspaceHints", {}).get("paths", [])
-    for p in hint_paths:
-        if forbidden and any(fnmatch.fnmatch(p, fpat) for fpat in forbidden):
-            warnings.append(f"{path}: workspace hint '{p}' overlaps forbiddenPaths")
-        if allowed and not any(fnmatch.fnmatch(p, apat) for apat in allowed):
-            warnings.append(f"{path}: workspace hint '{p}' not covered by allowedPaths")
-    return warnings
 
 
 def render_checklist(scenario: dict, agent: dict) -> str:
@@ -215,32 +85,81 @@ def main() -> int:
         action="store_true",
         help="Append run metadata to agent-ecosystems/logs/runs/runs.jsonl",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Validate scenarios in N worker processes (default: 1)",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Revalidate every scenario, ignoring the validation result cache",
+    )
+    parser.add_argument(
+        "--changed",
+        action="store_true",
+        help="Only revalidate (and report) scenarios whose inputs changed since the last run",
+    )
+    parser.add_argument(
+        "--execute",
+        action="store_true",
+        help="Execute valid scenarios through an agent backend and record metrics",
+    )
+    parser.add_argument(
+        "--backend",
+        default="stub",
+        help="Agent backend for --execute: 'stub' (default) or 'module:factory'",
+    )
+    parser.add_argument(
+        "--stub-latency-ms",
+        type=float,
+        default=0.0,
+        help="Simulated latency per stub agent turn and per stub MCP tool call",
+    )
     parser.add_argument(
         "--list-circuits",
         action="store_true",
         help="List available circuits (if configured)",
     )
     args = parser.parse_args()
-
-    agents = load_json_files(ECOSYSTEM_ROOT / "agents")
-    toolsets = load_json_files(ECOSYSTEM_ROOT / "toolsets")
-    stacks = load_json_files(ECOSYSTEM_ROOT / "stacks")  # reserved for future use
-    contracts = load_contracts()
-    circuits = load_circuits()
+    if args.jobs < 1:
+        parser.error("--jobs must be >= 1")
+    if args.changed and args.no_cache:
+        parser.error("--changed relies on the validation cache; drop --no-cache")
+    if args.stub_latency_ms < 0:
+        parser.error("--stub-latency-ms must be >= 0")
+    latency = args.stub_latency_ms / 1000
+    backend = None
+    if args.execute:
+        try:
+            backend = load_backend(args.backend, latency=latency)
+        except (ImportError, AttributeError, ValueError) as exc:
+            parser.error(f"--backend: {exc}")
+
+    data = EcosystemData.load()
 
     if args.list_circuits:
         print("Available circuits:")
-        for cid, data in circuits.items():
+        for cid, circuit in data.circuits.items():
             print(
-                f"- {cid} (stack={data.get('stackId')}, pattern={data.get('pattern')}, agents={[a.get('id') for a in data.get('agents', [])]})"
+                f"- {cid} (stack={circuit.get('stackId')}, pattern={circuit.get('pattern')}, agents={[a.get('id') for a in circuit.get('agents', [])]})"
             )
         return 0
 
-    schema = load_schema()
+    cache = None if args.no_cache else open_scenario_cache()
+    report = validate_scenarios(
+        data,
+        validate_outputs=args.validate_outputs,
+        jobs=args.jobs,
+        cache=cache,
+        changed_only=args.changed,
+    )
+    if cache is not None:
+        cache.save()
 
-    all_errors: List[str] = []
-    all_warnings: List[str] = []
     summary: List[str] = []
+    runs: List[ScenarioRun] = []
 
     if args.no_output:
         output_dir = None
@@ -248,78 +167,76 @@ def main() -> int:
         OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
         output_dir = OUTPUT_DIR
 
-    for path in sorted(SCENARIO_DIR.glob("*.yaml")):
-        scenario = yaml.safe_load(path.read_text(encoding="utf-8"))
-        errs = []
-        errs.extend(validate_against_schema(scenario, schema, path))
-        errs.extend(
-            validate_cross_references(
-                scenario, agents, toolsets, contracts, circuits, path
-            )
-        )
-
-        contract = contracts.get(scenario.get("agentId"))
-        warnings = []
-        if not errs:
-            warnings = check_contract_warnings(scenario, contract, path)
-            all_warnings.extend(warnings)
-
-        if args.validate_outputs and not errs and contract:
-            schema_obj = load_structured_schema(contract.get("structuredOutputSchema"))
-            errs.extend(
-                validate_output_fixture(scenario.get("id"), contract, schema_obj)
-            )
+    # Entries are written in one append after the loop (see run_log).
+    logger = RunLogger(LOG_PATH) if args.log_runs else None
 
-        status = "OK" if not errs else "FAIL"
-        notes = ""
-        if errs:
-            all_errors.extend(errs)
-            notes = f"{len(errs)} error(s)"
-        elif warnings:
-            notes = f"{len(warnings)} warning(s)"
-        summary.append(f"{path.stem} | {scenario.get('agentId')} | {status} | {notes}")
+    for result in report.results:
+        path, scenario = result.path, result.scenario
+        summary.append(
+            f"{path.stem} | {scenario.get('agentId')} | {result.status} | {result.notes}"
+        )
 
-        if not errs and output_dir:
-            agent = agents.get(scenario["agentId"], {})
+        if not result.errors and output_dir:
+            agent = data.agents.get(scenario["agentId"], {})
             md = render_checklist(scenario, agent)
             (output_dir / f"{path.stem}.md").write_text(md, encoding="utf-8")
 
-        if args.log_runs:
-            status_field = "success" if not errs else "failure"
-            subprocess.run(
-                [
-                    sys.executable,
-                    str(LOG_SCRIPT),
-                    "--agent",
-                    scenario.get("agentId", ""),
-                    "--stack",
-                    scenario.get("stackId", ""),
-                    "--status",
-                    status_field,
-                    "--scenario",
-                    scenario.get("id", ""),
-                    "--circuit",
-                    scenario.get("circuitId", ""),
-                ],
-                check=False,
+        run = None
+        if backend is not None and not result.errors:
+            run = execute_scenario(scenario, data, backend, server_latency=latency)
+            runs.append(run)
+            if output_dir:
+                (output_dir / f"{path.stem}.run.json").write_text(
+                    json.dumps(run.to_json(), indent=2) + "\n", encoding="utf-8"
+                )
+
+        if logger is not None:
+            logger.log(
+                scenario.get("agentId", ""),
+                scenario.get("stackId", ""),
+                run.status if run else "success" if not result.errors else "failure",
+                scenario=scenario.get("id", ""),
+                circuit=scenario.get("circuitId", ""),
+                tool_calls=len(run.tool_calls) if run else 0,
+                duration_ms=round(run.duration_ms) if run else 0,
             )
 
+    if logger is not None:
+        logger.flush()
+
     print("SCENARIO ID | AGENT | STATUS | NOTES")
     for row in summary:
         print(row)
+    if args.changed:
+        print(f"Skipped {report.unchanged} unchanged scenario(s).")
+        failed = report.failed_unchanged
+        if failed:
+            print(f"Unchanged scenario(s) still failing (cached): {len(failed)}")
+            for result in failed:
+                print(f"- {result.path.stem} | {result.scenario.get('agentId')} | {result.notes}")
+
+    if runs:
+        print()
+        print("SCENARIO ID | AGENT | RUN | TOOL CALLS | DURATION MS")
+        for run in runs:
+            print(
+                f"{run.scenario_id} | {run.agent_id} | {run.status} | "
+                f"{len(run.tool_calls)} | {run.duration_ms:.1f}"
+            )
 
-    if all_errors:
+    run_errors = [e for run in runs for e in run.errors]
+    if report.errors or run_errors:
         print("Errors:")
-        for e in all_errors:
+        for e in report.errors + run_errors:
             print(f"- {e}")
         return 1
 
-    if all_warnings:
+    if report.warnings:
         print("Warnings:")
-        for w in all_warnings:
+        for w in report.warnings:
             print(f"- {w}")
 
-    print("All scenarios validated.")
+    print("All scenarios validated." + (" All runs passed." if runs else ""))
     return 0
 
 
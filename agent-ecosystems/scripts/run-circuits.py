@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""Execute agent circuits and report per-step latency.
+
+Usage:
+  python3 agent-ecosystems/scripts/run-circuits.py [--circuit ID ...] [--stub-latency-ms 20] [--agent-concurrency 1] [--concurrent] [--json] [--log-runs]
+
+Circuits are scheduled by circuit_runtime according to their pattern
+(handoff, manager-worker, parallel); independent steps run concurrently.
+The backend is the same as `run-agent-scenarios.py --execute` (default: the
+deterministic local stub). For each circuit the script prints every step's
+start, queue and run time, then wall time against the serial sum and the
+critical path. With --log-runs each step is appended to runs.jsonl.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from typing import List
+
+from circuit_runtime import CircuitError, CircuitRun, run_circuits
+from ecosystem_validation import EcosystemData
+from run_log import LOG_PATH, RunLogger
+from scenario_harness import load_backend
+
+
+def print_run(run: CircuitRun) -> None:
+    print(f"Circuit {run.circuit_id} ({run.pattern}, stack={run.stack_id}): {run.status}")
+    print("STEP | AGENT | AFTER | START MS | QUEUED MS | DURATION MS | TOOL CALLS")
+    for step in run.steps:
+        print(
+            f"{step.step.id} | {step.step.agent_id} | {','.join(step.step.after) or '-'} | "
+            f"{step.start_ms:.1f} | {step.queued_ms:.1f} | {step.duration_ms:.1f} | "
+            f"{step.tool_calls}"
+        )
+    print(
+        f"wall {run.wall_ms:.1f} ms | serial {run.serial_ms:.1f} ms | "
+        f"critical path {run.critical_path_ms:.1f} ms"
+    )
+    print()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Execute agent circuits")
+    parser.add_argument(
+        "--circuit",
+        action="append",
+        default=[],
+        help="Circuit id to run (repeatable; default: all circuits)",
+    )
+    parser.add_argument(
+        "--backend",
+        default="stub",
+        help="Agent backend: 'stub' (default) or 'module:factory'",
+    )
+    parser.add_argument(
+        "--stub-latency-ms",
+        type=float,
+        default=0.0,
+        help="Simulated latency per stub agent turn and per stub MCP tool call",
+    )
+    parser.add_argument(
+        "--agent-concurrency",
+        type=int,
+        default=1,
+        help="Concurrent steps per agent unless the circuit sets maxConcurrency (default: 1)",
+    )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Run the selected circuits at the same time instead of one by one",
+    )
+    parser.add_argument("--json", action="store_true", help="Print runs as JSON")
+    parser.add_argument(
+        "--log-runs",
+        action="store_true",
+        help="Append one entry per step to agent-ecosystems/logs/runs/runs.jsonl",
+    )
+    args = parser.parse_args()
+    if args.stub_latency_ms < 0:
+        parser.error("--stub-latency-ms must be >= 0")
+    if args.agent_concurrency < 1:
+        parser.error("--agent-concurrency must be >= 1")
+    latency = args.stub_latency_ms / 1000
+    try:
+        backend = load_backend(args.backend, latency=latency)
+    except (ImportError, AttributeError, ValueError) as exc:
+        parser.error(f"--backend: {exc}")
+
+    data = EcosystemData.load()
+    selected = args.circuit or sorted(data.circuits)
+    unknown = [cid for cid in selected if cid not in data.circuits]
+    if unknown:
+        sys.stderr.write(f"[circuits] Error: unknown circuit(s): {', '.join(unknown)}\n")
+        return 1
+
+    try:
+        runs: List[CircuitRun] = run_circuits(
+            [data.circuits[cid] for cid in selected],
+            data,
+            backend,
+            agent_concurrency=args.agent_concurrency,
+            server_latency=latency,
+            concurrent=args.concurrent,
+        )
+    except CircuitError as exc:
+        sys.stderr.write(f"[circuits] Error: {exc}\n")
+        return 1
+
+    if args.log_runs:
+        with RunLogger(LOG_PATH) as logger:
+            for run in runs:
+                for step in run.steps:
+                    logger.log(
+                        step.step.agent_id,
+                        run.stack_id,
+                        step.status,
+                        circuit=run.circuit_id,
+                        tool_calls=step.tool_calls,
+                        duration_ms=round(step.duration_ms),
+                    )
+
+    if args.json:
+        print(json.dumps([run.to_json() for run in runs], indent=2))
+    else:
+        for run in runs:
+            print_run(run)
+
+    errors = [e for run in runs for e in run.errors]
+    if errors:
+        print("Errors:")
+        for err in errors:
+            print(f"- {err}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+"""Importable writer for agent run logs (agent-ecosystems/logs/runs/*.jsonl).
+
+RunLogger buffers entries and appends them to the log in a single write,
+either when flush() is called (or the logger is closed) or every
+`flush_every` entries. log-agent-run.py and run-agent-scenarios.py
+--log-runs both go through it.
+"""
+from __future__ import annotations
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[2]
+LOG_DIR = ROOT / "agent-ecosystems" / "logs" / "runs"
+LOG_PATH = LOG_DIR / "runs.jsonl"
+
+
+def make_entry(
+    agent: str,
+    stack: str,
+    status: str,
+    scenario: Optional[str] = None,
+    circuit: Optional[str] = None,
+    tool_calls: int = 0,
+    duration_ms: int = 0,
+    timestamp: Optional[str] = None,
+) -> dict:
+    return {
+        "timestamp": timestamp or datetime.now(timezone.utc).isoformat(),
+        "agentId": agent,
+        "stackId": stack,
+        "scenarioId": scenario,
+        "circuitId": circuit,
+        "status": status,
+        "toolCalls": tool_calls,
+        "durationMs": duration_ms,
+    }
+
+
+class RunLogger:
+    """Buffer run entries and append them to `path` in batches."""
+
+    def __init__(self, path: Path = LOG_PATH, flush_every: Optional[int] = None):
+        if flush_every is not None and flush_every < 1:
+            raise ValueError("flush_every must be >= 1")
+        self.path = path
+        self.flush_every = flush_every
+        self._lines: List[str] = []
+        self.written = 0
+
+    def add(self, entry: dict) -> None:
+        self._lines.append(json.dumps(entry) + "\n")
+        if self.flush_every and len(self._lines) >= self.flush_every:
+            self.flush()
+
+    def log(self, agent: str, stack: str, status: str, **fields) -> dict:
+        """Build an entry (see make_entry) and buffer it."""
+        entry = make_entry(agent, stack, status, **fields)
+        self.add(entry)
+        return entry
+
+    def flush(self) -> None:
+        if not self._lines:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # One append per batch keeps concurrent writers' lines intact and
+        # avoids reopening the file per entry.
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write("".join(self._lines))
+        self.written += len(self._lines)
+        self._lines.clear()
+
+    def close(self) -> None:
+        self.flush()
+
+    def __len__(self) -> int:
+        return len(self._lines)
+
+    def __enter__(self) -> "RunLogger":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
@@ -0,0 +1,276 @@
+"""Execute agent scenarios against a pluggable agent backend.
+
+Each scenario's `inputs` are sent, one turn at a time, to an AgentBackend.
+The backend sees the MCP servers of the scenario's toolsets through a
+ToolBox, which times and records every tool call, so tool-call counts and
+latencies come from the harness rather than from the backend's own report.
+The structured output of the last turn that returned one is validated
+against the contract's structuredOutputSchema.
+
+The default backend, StubAgent, is deterministic and needs no model: it
+calls stub MCP servers (StubMcpServer, one per toolset server entry) and
+replays the scenario's output fixture as its structured output. Optional
+simulated latencies make timings meaningful for baselines. Other backends
+are plain classes with a `respond(request) -> AgentReply` method, selected
+with load_backend("package.module:ClassName").
+"""
+from __future__ import annotations
+
+import hashlib
+import importlib
+import json
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Protocol
+
+from ecosystem_validation import (
+    OUTPUT_FIXTURE_DIR,
+    EcosystemData,
+    load_json_from_path,
+    structured_output_validator,
+)
+from schema_registry import schema_errors
+
+
+def _stable_index(text: str, modulo: int) -> int:
+    digest = hashlib.sha256(text.encode("utf-8")).digest()
+    return int.from_bytes(digest[:4], "big") % modulo
+
+
+@dataclass
+class ToolCall:
+    server: str
+    tool: str
+    arguments: dict
+    result: object
+    duration_ms: float
+
+    def to_json(self) -> dict:
+        return {
+            "server": self.server,
+            "tool": self.tool,
+            "arguments": self.arguments,
+            "durationMs": round(self.duration_ms, 3),
+        }
+
+
+class StubMcpServer:
+    """Deterministic stand-in for one toolset `mcpServers` entry.
+
+    Its tools are the entry's scopes (or a single "query" tool); every call
+    returns a result derived only from the server, tool and arguments.
+    """
+
+    def __init__(self, spec: dict, latency: float = 0.0):
+        self.id: str = spec["id"]
+        self.kind: str = spec.get("kind", "stdio")
+        self.tools: List[str] = list(spec.get("scopes") or ["query"])
+        self.latency = latency
+
+    def call(self, tool: str, arguments: dict) -> dict:
+        if tool not in self.tools:
+            raise KeyError(f"MCP server '{self.id}' has no tool '{tool}'")
+        if self.latency:
+            time.sleep(self.latency)
+        payload = json.dumps([self.id, tool, arguments], sort_keys=True)
+        return {
+            "server": self.id,
+            "tool": tool,
+            "ok": True,
+            "digest": hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16],
+        }
+
+
+def stub_servers_for(
+    toolset_ids: List[str], data: EcosystemData, latency: float = 0.0
+) -> Dict[str, StubMcpServer]:
+    """Stub servers for every MCP server declared by the given toolsets."""
+    servers: Dict[str, StubMcpServer] = {}
+    for toolset_id in toolset_ids:
+        for spec in data.toolsets.get(toolset_id, {}).get("mcpServers", []):
+            servers.setdefault(spec["id"], StubMcpServer(spec, latency))
+    return servers
+
+
+class ToolBox:
+    """The MCP servers one agent run may use; records every call made."""
+
+    def __init__(self, servers: Dict[str, StubMcpServer]):
+        self.servers = servers
+        self.calls: List[ToolCall] = []
+        self._lock = threading.Lock()
+
+    def tools(self) -> Dict[str, List[str]]:
+        return {sid: list(server.tools) for sid, server in self.servers.items()}
+
+    def call(self, server: str, tool: str, arguments: dict) -> object:
+        if server not in self.servers:
+            raise KeyError(f"MCP server '{server}' is not available to this agent")
+        start = time.perf_counter()
+        result = self.servers[server].call(tool, arguments)
+        elapsed = (time.perf_counter() - start) * 1000
+        with self._lock:
+            self.calls.append(ToolCall(server, tool, arguments, result, elapsed))
+        return result
+
+
+@dataclass
+class AgentRequest:
+    agent_id: str
+    agent: dict
+    contract: Optional[dict]
+    scenario: dict
+    message: str
+    turn: int
+    tools: ToolBox
+    # Replies from earlier turns (and, in circuits, earlier agents).
+    history: List["AgentReply"] = field(default_factory=list)
+
+    @property
+    def last_turn(self) -> bool:
+        return self.turn == len(self.scenario.get("inputs", [])) - 1
+
+
+@dataclass
+class AgentReply:
+    text: str
+    structured_output: Optional[dict] = None
+
+
+class AgentBackend(Protocol):
+    def respond(self, request: AgentRequest) -> AgentReply: ...
+
+
+class StubAgent:
+    """Deterministic local backend.
+
+    For each turn it makes one tool call, picking the server and tool from a
+    hash of the message. On the last turn of an agent whose contract declares
+    a structuredOutputSchema it returns the scenario's output fixture.
+    """
+
+    def __init__(self, latency: float = 0.0, fixture_dir: Path = OUTPUT_FIXTURE_DIR):
+        self.latency = latency
+        self.fixture_dir = fixture_dir
+
+    def respond(self, request: AgentRequest) -> AgentReply:
+        if self.latency:
+            time.sleep(self.latency)
+        tools = request.tools.tools()
+        if tools:
+            servers = sorted(tools)
+            server = servers[_stable_index(request.message, len(servers))]
+            names = tools[server]
+            tool = names[_stable_index(f"{request.turn}:{request.message}", len(names))]
+            request.tools.call(server, tool, {"query": request.message})
+        structured = None
+        contract = request.contract or {}
+        if request.last_turn and contract.get("structuredOutputSchema"):
+            fixture = self.fixture_dir / f"{request.scenario.get('id')}.json"
+            if fixture.exists():
+                structured = load_json_from_path(fixture)
+        return AgentReply(
+            text=f"[stub:{request.agent_id}] turn {request.turn + 1}: {request.message}",
+            structured_output=structured,
+        )
+
+
+BACKENDS: Dict[str, Callable[..., AgentBackend]] = {"stub": StubAgent}
+
+
+def load_backend(spec: str, latency: float = 0.0) -> AgentBackend:
+    """A built-in backend by name ("stub") or "module:attr" for a custom factory."""
+    if spec in BACKENDS:
+        return BACKENDS[spec](latency=latency)
+    module_name, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"Unknown agent backend '{spec}' (use 'stub' or 'module:attr')")
+    factory = getattr(importlib.import_module(module_name), attr)
+    return factory()
+
+
+@dataclass
+class ScenarioRun:
+    scenario_id: str
+    agent_id: str
+    replies: List[AgentReply] = field(default_factory=list)
+    tool_calls: List[ToolCall] = field(default_factory=list)
+    duration_ms: float = 0.0
+    structured_output: Optional[dict] = None
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def status(self) -> str:
+        return "success" if not self.errors else "failure"
+
+    def to_json(self) -> dict:
+        return {
+            "scenarioId": self.scenario_id,
+            "agentId": self.agent_id,
+            "status": self.status,
+            "durationMs": round(self.duration_ms, 3),
+            "toolCalls": [call.to_json() for call in self.tool_calls],
+            "replies": [reply.text for reply in self.replies],
+            "structuredOutput": self.structured_output,
+            "errors": self.errors,
+        }
+
+
+def check_structured_output(
+    label: str, output: Optional[dict], contract: Optional[dict]
+) -> List[str]:
+    """Validate `output` against the contract's structuredOutputSchema, if any."""
+    schema_path = (contract or {}).get("structuredOutputSchema")
+    if not schema_path:
+        return []
+    if output is None:
+        return [f"{label}: no structured output returned (contract requires {schema_path})"]
+    try:
+        validator = structured_output_validator(schema_path)
+    except FileNotFoundError as exc:
+        return [f"{label}: {exc}"]
+    return schema_errors(validator, output, Path(label))
+
+
+def execute_scenario(
+    scenario: dict,
+    data: EcosystemData,
+    backend: AgentBackend,
+    server_latency: float = 0.0,
+) -> ScenarioRun:
+    """Drive every input of `scenario` through `backend` and check the result."""
+    agent_id = scenario.get("agentId", "")
+    run = ScenarioRun(scenario_id=scenario.get("id", ""), agent_id=agent_id)
+    contract = data.contracts.get(agent_id)
+    tools = ToolBox(stub_servers_for(scenario.get("toolsets", []), data, server_latency))
+    start = time.perf_counter()
+    try:
+        for turn, message in enumerate(scenario.get("inputs", [])):
+            reply = backend.respond(
+                AgentRequest(
+                    agent_id=agent_id,
+                    agent=data.agents.get(agent_id, {}),
+                    contract=contract,
+                    scenario=scenario,
+                    message=message,
+                    turn=turn,
+                    tools=tools,
+                    history=list(run.replies),
+                )
+            )
+            run.replies.append(reply)
+            if reply.structured_output is not None:
+                run.structured_output = reply.structured_output
+    except Exception as exc:  # backend failures are recorded, not raised
+        run.errors.append(f"{run.scenario_id}: backend error: {exc}")
+    run.duration_ms = (time.perf_counter() - start) * 1000
+    run.tool_calls = list(tools.calls)
+    if not run.errors:
+        run.errors.extend(
+            check_structured_output(
+                f"{run.scenario_id} output", run.structured_output, contract
+            )
+        )
+    return run
@@ -0,0 +1,105 @@
+"""Load ecosystem JSON Schemas once and reuse compiled validators.
+
+Every schema under agent-ecosystems/schemas is read at first use and
+registered by its $id, so $ref resolution is shared. Validators are built
+once per schema (or per schema file for the scenario/structured-output
+schemas that live elsewhere) and reused for every instance. They are
+immutable, so worker threads can share them.
+"""
+from __future__ import annotations
+
+import json
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import yaml
+from jsonschema import Draft202012Validator
+from referencing import Registry, Resource
+from referencing.jsonschema import DRAFT202012
+
+ROOT = Path(__file__).resolve().parents[2]
+SCHEMA_DIR = ROOT / "agent-ecosystems" / "schemas"
+
+
+def load_schema_file(path: Path) -> dict:
+    """Read a JSON or YAML schema document."""
+    text = path.read_text(encoding="utf-8")
+    if path.suffix in {".yaml", ".yml"}:
+        return yaml.safe_load(text)
+    return json.loads(text)
+
+
+class SchemaRegistry:
+    """Schemas from one directory plus compiled validators, built on demand."""
+
+    def __init__(self, schema_dir: Path = SCHEMA_DIR):
+        self.schema_dir = schema_dir
+        self.schemas: Dict[str, dict] = {}
+        resources: List[Tuple[str, Resource]] = []
+        for path in sorted(schema_dir.glob("*.schema.json")):
+            schema = load_schema_file(path)
+            self.schemas[path.name] = schema
+            if schema.get("$id"):
+                resources.append(
+                    (
+                        schema["$id"],
+                        Resource.from_contents(
+                            schema, default_specification=DRAFT202012
+                        ),
+                    )
+                )
+        self.refs = Registry().with_resources(resources)
+        self._validators: Dict[str, Draft202012Validator] = {}
+        # path -> (mtime_ns, validator); re-read when the file changes.
+        self._file_validators: Dict[Path, Tuple[int, Draft202012Validator]] = {}
+        self._lock = threading.Lock()
+
+    def compile(self, schema: dict) -> Draft202012Validator:
+        return Draft202012Validator(schema, registry=self.refs)
+
+    def validator(self, name: str) -> Draft202012Validator:
+        """Validator for a schema in schema_dir, e.g. "bundle.schema.json"."""
+        with self._lock:
+            validator = self._validators.get(name)
+            if validator is None:
+                if name not in self.schemas:
+                    raise FileNotFoundError(f"Missing schema: {self.schema_dir / name}")
+                validator = self._validators[name] = self.compile(self.schemas[name])
+        return validator
+
+    def validator_for_file(self, path: Path) -> Draft202012Validator:
+        """Validator for a schema file outside schema_dir (JSON or YAML)."""
+        path = path.resolve()
+        if not path.exists():
+            raise FileNotFoundError(f"Missing schema: {path}")
+        mtime = path.stat().st_mtime_ns
+        with self._lock:
+            cached = self._file_validators.get(path)
+            if cached and cached[0] == mtime:
+                return cached[1]
+        validator = self.compile(load_schema_file(path))
+        with self._lock:
+            self._file_validators[path] = (mtime, validator)
+        return validator
+
+
+@lru_cache(maxsize=None)
+def get_registry(schema_dir: Path = SCHEMA_DIR) -> SchemaRegistry:
+    """Process-wide registry; call get_registry.cache_clear() after schema edits."""
+    return SchemaRegistry(schema_dir)
+
+
+def schema_errors(
+    validator: Draft202012Validator,
+    instance: object,
+    path: Path,
+    separator: str = "/",
+) -> List[str]:
+    """Format every validation error as "<path>: <location>: <message>"."""
+    errors: List[str] = []
+    for err in validator.iter_errors(instance):
+        location = separator.join(str(p) for p in err.path) or "<root>"
+        errors.append(f"{path}: {location}: {err.message}")
+    return errors
@@ -1,61 +1,60 @@
 #!/usr/bin/env python3
-"""Summarise agent run logs from agent-ecosystems/logs/runs/*.jsonl."""
+"""Summarise agent run logs from agent-ecosystems/logs/runs/*.jsonl.
+
+Logs are streamed line by line into log_summary.LogSummary, so memory use
+depends on the number of distinct agents, scenarios and statuses, not on
+the size of the logs. Latency percentiles (p50/p90/p95/p99/max) per agent,
+scenario, circuit and stack come from mergeable quantile sketches.
+
+Summaries are incremental: per-file checkpoints in
+dist/cache/log-summary-state.json let a run read only lines appended since
+the previous one (rotated or truncated files are rescanned automatically).
+With --jobs N, log files (shards) that need scanning are read in N worker
+processes and their partial summaries merged.
+
+Usage:
+  python3 agent-ecosystems/scripts/summarise-logs.py [--jobs N] [--rebuild | --no-cache]
+"""
 from __future__ import annotations
 
-import json
-from collections import Counter, defaultdict
-from pathlib import Path
-from statistics import mean
-
-ROOT = Path(__file__).resolve().parents[2]
-LOG_DIR = ROOT / "agent-ecosystems" / "logs" / "runs"
-
-
-def load_logs():
-    entries = []
-    if not LOG_DIR.exists():
-        return entries
-    for path in LOG_DIR.glob("*.jsonl"):
-        for line in path.read_text(encoding="utf-8").splitlines():
-            try:
-                entries.append(json.loads(line))
-            except Exception:
-                continue
-    return entries
-
-
-def summarise(entries):
-    by_agent = Counter()
-    by_scenario = Counter()
-    durations = defaultdict(list)
-    statuses = Counter()
-    for e in entries:
-        by_agent[e.get("agentId")] += 1
-        if e.get("scenarioId"):
-            by_scenario[e["scenarioId"]] += 1
-        statuses[e.get("status")] += 1
-        durations[e.get("agentId")].append(e.get("durationMs", 0))
-
-    print("Runs per agent:")
-    for agent, count in by_agent.items():
-        avg = mean(durations[agent]) if durations[agent] else 0
-        print(f"- {agent}: {count} runs (avg duration {avg:.1f} ms)")
-
-    print("\nRuns per scenario:")
-    for scen, count in by_scenario.items():
-        print(f"- {scen}: {count} runs")
-
-    print("\nStatuses:")
-    for status, count in statuses.items():
-        print(f"- {status}: {count}")
+import argparse
+
+from log_summary import SummaryState, log_files, summarise_files
 
 
 def main() -> int:
-    entries = load_logs()
-    if not entries:
+    parser = argparse.ArgumentParser(description="Summarise agent run logs")
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Discard saved checkpoints and rescan every log",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Rescan every log without reading or writing checkpoints",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Scan log files in N worker processes (default: 1)",
+    )
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be >= 1")
+
+    paths = log_files()
+    if args.no_cache:
+        summary = summarise_files(paths, jobs=args.jobs)
+    else:
+        state = SummaryState() if args.rebuild else SummaryState.load()
+        summary = state.refresh(paths, jobs=args.jobs)
+        state.save()
+    if not summary.entries:
         print("No logs found.")
         return 0
-    summarise(entries)
+    print(summary.report())
     return 0
 
 
@@ -2,48 +2,21 @@
 """Validate agent ecosystem JSON files against their schemas.
 
 Validates all JSON files under agent-ecosystems/{agents,toolsets,stacks,bundles}
-using the schemas in agent-ecosystems/schemas.
+using the schemas in agent-ecosystems/schemas. The checks live in
+ecosystem_validation.validate_configs so other scripts can run them in-process.
+Results are cached per file under dist/cache/validation (see
+validation_cache); set NO_VALIDATION_CACHE=1 to revalidate everything.
 """
 from __future__ import annotations
 
-import json
 import sys
-from pathlib import Path
-from typing import Dict, List, Tuple
 
-from jsonschema import Draft202012Validator, RefResolver
-
-ROOT = Path(__file__).resolve().parents[2]
-ECOSYSTEM_ROOT = ROOT / "agent-ecosystems"
-SCHEMA_DIR = ECOSYSTEM_ROOT / "schemas"
-
-# Map subdirectory to schema filename
-SCHEMA_MAP = {
-    "agents": "agent.schema.json",
-    "toolsets": "toolset.schema.json",
-    "stacks": "stack.schema.json",
-    "bundles": "bundle.schema.json",
-}
-
-
-def load_schema_store() -> Dict[str, dict]:
-    store: Dict[str, dict] = {}
-    for schema_path in SCHEMA_DIR.glob("*.schema.json"):
-        data = json.loads(schema_path.read_text(encoding="utf-8"))
-        schema_id = data.get("$id")
-        if schema_id:
-            store[schema_id] = data
-    return store
-
-
-def validate_file(path: Path, schema: dict, resolver: RefResolver) -> List[str]:
-    errors: List[str] = []
-    instance = json.loads(path.read_text(encoding="utf-8"))
-    validator = Draft202012Validator(schema, resolver=resolver)
-    for error in validator.iter_errors(instance):
-        location = " / ".join(str(p) for p in error.path) or "<root>"
-        errors.append(f"{path}: {location}: {error.message}")
-    return errors
+from ecosystem_validation import (
+    ECOSYSTEM_ROOT,
+    EcosystemData,
+    open_config_cache,
+    validate_configs,
+)
 
 
 def main() -> int:
@@ -51,32 +24,16 @@ def main() -> int:
         sys.stderr.write("agent-ecosystems directory not found.\n")
         return 1
 
-    store = load_schema_store()
-    resolver = RefResolver.from_schema({}, store=store)
-    all_errors: List[str] = []
-    checked: List[Tuple[str, int]] = []
-
-    for subdir, schema_file in SCHEMA_MAP.items():
-        schema_path = SCHEMA_DIR / schema_file
-        if not schema_path.exists():
-            all_errors.append(f"Missing schema: {schema_path}")
-            continue
-        schema = json.loads(schema_path.read_text(encoding="utf-8"))
-        target_dir = ECOSYSTEM_ROOT / subdir
-        if not target_dir.exists():
-            continue
-        count = 0
-        for path in sorted(target_dir.glob("*.json")):
-            count += 1
-            all_errors.extend(validate_file(path, schema, resolver))
-        checked.append((subdir, count))
+    cache = open_config_cache()
+    report = validate_configs(EcosystemData.load(), cache=cache)
+    cache.save()
 
-    for subdir, count in checked:
+    for subdir, count in report.checked.items():
         print(f"Validated {count} file(s) in {subdir}/")
 
-    if all_errors:
+    if report.errors:
         print("Validation errors:")
-        for err in all_errors:
+        for err in report.errors:
             print(f"- {err}")
         return 1
 
@@ -0,0 +1,201 @@
+"""On-disk cache of validation results shared by the repo's validator scripts.
+
+Each validator opens a namespace (one JSON file under dist/cache/validation)
+tagged with a rule-set digest: the validator's own source, the schemas it
+applies and anything else that changes its verdicts. Entries are keyed per
+checked file by the digest of that file's content. Rules that look at other
+files declare them when storing a result (a dependency map of repo-relative
+file -> digest, or glob -> digest of its listing when only existence
+matters); lookup() only returns a hit while every declared dependency is
+unchanged. A changed rule-set drops the whole namespace.
+
+Set NO_VALIDATION_CACHE=1 to bypass the cache (nothing is read or written).
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+ROOT = Path(__file__).resolve().parents[2]
+VALIDATION_CACHE_DIR = ROOT / "dist" / "cache" / "validation"
+# Bump when the entry layout changes so old cache files are ignored.
+VALIDATION_CACHE_FORMAT = 1
+
+_file_digests: Dict[Path, str] = {}
+
+
+def cache_disabled() -> bool:
+    return os.environ.get("NO_VALIDATION_CACHE", "") not in {"", "0"}
+
+
+def file_digest(path: Path) -> str:
+    """sha256 of a file's bytes ("missing" if absent), memoised per process."""
+    path = Path(path)
+    digest = _file_digests.get(path)
+    if digest is None:
+        try:
+            digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        except FileNotFoundError:
+            digest = "missing"
+        _file_digests[path] = digest
+    return digest
+
+
+def value_digest(value: object) -> str:
+    """sha256 of a JSON-serialisable value in canonical form."""
+    text = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def ruleset_digest(*parts: Union[Path, str]) -> str:
+    """Digest of validator sources, schemas (Paths, by content) and version strings."""
+    h = hashlib.sha256(f"format={VALIDATION_CACHE_FORMAT}\n".encode("utf-8"))
+    for part in parts:
+        if isinstance(part, Path):
+            h.update(f"{part.name}={file_digest(part)}\n".encode("utf-8"))
+        else:
+            h.update(f"{part}\n".encode("utf-8"))
+    return h.hexdigest()
+
+
+def cache_name(path: Path) -> str:
+    """Entry name for a checked file: repo-relative where possible."""
+    path = Path(path).resolve()
+    try:
+        return path.relative_to(ROOT).as_posix()
+    except ValueError:
+        return path.as_posix()
+
+
+def dependency_digest(name: str) -> str:
+    """Digest of a declared dependency.
+
+    `name` is a repo-relative file (hashed by content) or a glob such as
+    "agent-ecosystems/agents/*.json" (hashed by the sorted list of matches),
+    used where a rule only cares whether something exists.
+    """
+    if any(ch in name for ch in "*?["):
+        return value_digest(sorted(cache_name(p) for p in ROOT.glob(name)))
+    return file_digest(ROOT / name)
+
+
+def dependency_map(names: Iterable[str]) -> Dict[str, str]:
+    return {name: dependency_digest(name) for name in names}
+
+
+class ValidationCache:
+    """Cached results for one validator, keyed by checked file."""
+
+    def __init__(
+        self,
+        namespace: str,
+        ruleset: str,
+        entries: Optional[Dict[str, dict]] = None,
+        cache_dir: Path = VALIDATION_CACHE_DIR,
+        enabled: bool = True,
+    ):
+        self.namespace = namespace
+        self.ruleset = ruleset
+        self.entries: Dict[str, dict] = entries or {}
+        self.path = cache_dir / f"{namespace}.json"
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+
+    @classmethod
+    def open(
+        cls,
+        namespace: str,
+        ruleset: str,
+        cache_dir: Path = VALIDATION_CACHE_DIR,
+    ) -> "ValidationCache":
+        if cache_disabled():
+            return cls(namespace, ruleset, cache_dir=cache_dir, enabled=False)
+        entries: Dict[str, dict] = {}
+        path = cache_dir / f"{namespace}.json"
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            data = {}
+        if (
+            data.get("format") == VALIDATION_CACHE_FORMAT
+            and data.get("ruleset") == ruleset
+        ):
+            entries = data.get("entries", {})
+        return cls(namespace, ruleset, entries, cache_dir=cache_dir)
+
+    def key(self, path: Path, *extra: object) -> str:
+        """Input key for `path`: its content digest plus any extra JSON values."""
+        if not extra:
+            return file_digest(path)
+        return value_digest([file_digest(path), *extra])
+
+    def stale_dependencies(self, name: str) -> List[str]:
+        """Declared dependencies of `name` whose digest changed since it was stored."""
+        entry = self.entries.get(name) or {}
+        return [
+            dep
+            for dep, digest in entry.get("deps", {}).items()
+            if dependency_digest(dep) != digest
+        ]
+
+    def lookup(self, name: str, key: str) -> Optional[dict]:
+        """Return the cached result for `name` if its key and dependencies match."""
+        entry = self.entries.get(name) if self.enabled else None
+        if (
+            entry is not None
+            and entry.get("key") == key
+            and not self.stale_dependencies(name)
+        ):
+            self.hits += 1
+            return entry["result"]
+        self.misses += 1
+        return None
+
+    def store(
+        self,
+        name: str,
+        key: str,
+        result: dict,
+        deps: Optional[Dict[str, str]] = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        entry = {"key": key, "result": result}
+        if deps is not None:
+            entry["deps"] = deps
+        if self.entries.get(name) != entry:
+            self.entries[name] = entry
+            self._dirty = True
+
+    def prune(self, names: Iterable[str]) -> None:
+        """Drop entries for files that no longer exist (not in `names`)."""
+        keep = set(names)
+        for name in [n for n in self.entries if n not in keep]:
+            del self.entries[name]
+            self._dirty = True
+
+    def save(self) -> None:
+        """Write the namespace file if anything changed (atomic replace)."""
+        if not self.enabled or not self._dirty:
+            return
+        payload = {
+            "format": VALIDATION_CACHE_FORMAT,
+            "ruleset": self.ruleset,
+            "entries": self.entries,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(prefix=f".{self.path.name}.", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(payload, f, sort_keys=True, default=str)
+            os.replace(tmp_name, self.path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self._dirty = False
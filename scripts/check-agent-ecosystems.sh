@@ -49,6 +49,9 @@ python3 agent-ecosystems/scripts/validate-ecosystem-configs.py
 log "Validating scenarios (static)"
 python3 agent-ecosystems/scripts/run-agent-scenarios.py --no-output
 
+log "Checking incremental log summaries"
+python3 agent-ecosystems/scripts/check-log-summary.py
+
 if [[ $WITH_BUNDLES -eq 1 ]]; then
 	log "Building bundles"
 	python3 agent-ecosystems/scripts/build-ecosystem-bundles.py
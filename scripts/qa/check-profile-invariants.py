@@ -12,6 +12,11 @@ Warnings (non-fatal):
 - Missing dist .code-profile
 - Missing agents directory for the slug
 - Orphaned SSoT assets (tasks/launch/snippets/keybindings) that reference unknown slugs
+
+The report is cached under dist/cache/validation (see
+agent-ecosystems/scripts/validation_cache.py) and reused while CONTROL.md,
+the maps and the relevant directory listings are unchanged; set
+NO_VALIDATION_CACHE=1 to always recheck.
 """
 
 from __future__ import annotations
@@ -29,6 +34,15 @@ EXPORT_MAP = ROOT / "vscode" / "export-map.yaml"
 DIST_PROFILES = ROOT / "vscode" / "profiles-dist"
 AGENTS_ROOT = ROOT / "agents"
 PACKS = ROOT / "vscode" / "packs"
+ASSET_SUBDIRS = ("tasks", "launch", "snippets", "keybindings")
+
+sys.path.insert(0, str(ROOT / "agent-ecosystems" / "scripts"))
+from validation_cache import (  # noqa: E402
+    ValidationCache,
+    cache_name,
+    dependency_map,
+    ruleset_digest,
+)
 
 
 def parse_control_slugs(path: Path) -> List[str]:
@@ -108,7 +122,21 @@ def warn_orphan_assets(known_slugs: Set[str]) -> List[str]:
     return warnings
 
 
-def main() -> int:
+def invariant_dependencies() -> List[str]:
+    """Everything the checks read besides CONTROL.md: the maps by content and,
+    for the existence checks, globs whose listings must stay the same."""
+    packs = PACKS.relative_to(ROOT).as_posix()
+    return [
+        PROFILE_MAP.relative_to(ROOT).as_posix(),
+        EXPORT_MAP.relative_to(ROOT).as_posix(),
+        f"{packs}/*/mcp/servers.*.json",
+        f"{DIST_PROFILES.relative_to(ROOT).as_posix()}/*.code-profile",
+        f"{AGENTS_ROOT.relative_to(ROOT).as_posix()}/*/*.agent.md",
+        *(f"{packs}/*/{subdir}/*" for subdir in ASSET_SUBDIRS),
+    ]
+
+
+def check_invariants() -> Dict:
     control_slugs = parse_control_slugs(CONTROL)
     profile_map = load_json_file(PROFILE_MAP)
     export_map = load_export_map(EXPORT_MAP)
@@ -157,15 +185,28 @@ def main() -> int:
 
     # Check for orphan assets referencing unknown slugs
     warnings.extend(warn_orphan_assets(set(control_slugs)))
+    return {"errors": errors, "warnings": warnings, "profiles": len(control_slugs)}
 
-    for line in warnings:
+
+def main() -> int:
+    cache = ValidationCache.open(
+        "profile-invariants", ruleset_digest(Path(__file__).resolve(), f"root={ROOT}")
+    )
+    name, key = cache_name(CONTROL), cache.key(CONTROL)
+    result = cache.lookup(name, key)
+    if result is None:
+        result = check_invariants()
+        cache.store(name, key, result, deps=dependency_map(invariant_dependencies()))
+        cache.save()
+
+    for line in result["warnings"]:
         print(line)
-    for line in errors:
+    for line in result["errors"]:
         print(line)
 
-    if errors:
+    if result["errors"]:
         return 1
-    print(f"All {len(control_slugs)} profiles satisfy invariants.")
+    print(f"All {result['profiles']} profiles satisfy invariants.")
     return 0
 
 
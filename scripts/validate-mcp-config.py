@@ -12,15 +12,26 @@ Warnings (non-fatal):
 Exit codes:
 - 0 on success
 - 1 on structural errors
+
+The result for a given mcp.json is cached under dist/cache/validation (see
+agent-ecosystems/scripts/validation_cache.py); set NO_VALIDATION_CACHE=1 to
+always recheck.
 """
 import json
 import sys
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 WORKSPACE_ROOT = Path(__file__).resolve().parent.parent
 MCP_PATH = WORKSPACE_ROOT / ".vscode" / "mcp.json"
 
+sys.path.insert(0, str(WORKSPACE_ROOT / "agent-ecosystems" / "scripts"))
+from validation_cache import ValidationCache, cache_name, ruleset_digest  # noqa: E402
+
+
+class McpConfigError(Exception):
+    pass
+
 
 def load_json(path: Path) -> Dict[str, Any]:
     try:
@@ -48,74 +59,92 @@ def looks_like_secret(val: str) -> bool:
 def _assert_required_keys(name: str, obj: Dict[str, Any], keys: list[str]) -> None:
     for key in keys:
         if key not in obj:
-            sys.stderr.write(f"ERROR: server '{name}' missing '{key}'\n")
-            sys.exit(1)
+            raise McpConfigError(f"ERROR: server '{name}' missing '{key}'")
 
 
 def _assert_string_field(name: str, obj: Dict[str, Any], key: str) -> None:
     if not isinstance(obj[key], str):
-        sys.stderr.write(f"ERROR: server '{name}' {key} must be string\n")
-        sys.exit(1)
+        raise McpConfigError(f"ERROR: server '{name}' {key} must be string")
 
 
 def _assert_list_of_strings(name: str, obj: Dict[str, Any], key: str) -> None:
     if not isinstance(obj[key], list) or not all(isinstance(a, str) for a in obj[key]):
-        sys.stderr.write(f"ERROR: server '{name}' {key} must be list[str]\n")
-        sys.exit(1)
+        raise McpConfigError(f"ERROR: server '{name}' {key} must be list[str]")
 
 
 def _assert_env_map(name: str, obj: Dict[str, Any], key: str) -> None:
     if not isinstance(obj[key], dict) or not all(
         isinstance(k, str) and isinstance(v, str) for k, v in obj[key].items()
     ):
-        sys.stderr.write(
-            f"ERROR: server '{name}' {key} must be object of string values\n"
+        raise McpConfigError(
+            f"ERROR: server '{name}' {key} must be object of string values"
         )
-        sys.exit(1)
 
 
-def _warn_command_not_sh(name: str, obj: Dict[str, Any]) -> None:
+def _warn_command_not_sh(name: str, obj: Dict[str, Any], warnings: List[str]) -> None:
     if obj["command"] != "/bin/sh":
-        sys.stderr.write(
-            f"WARN: server '{name}' command is not /bin/sh (got '{obj['command']}')\n"
+        warnings.append(
+            f"WARN: server '{name}' command is not /bin/sh (got '{obj['command']}')"
         )
 
 
-def _warn_args_not_prefix(name: str, obj: Dict[str, Any]) -> None:
+def _warn_args_not_prefix(name: str, obj: Dict[str, Any], warnings: List[str]) -> None:
     if len(obj["args"]) < 2 or obj["args"][0] != "-c":
-        sys.stderr.write(f"WARN: server '{name}' args do not start with ['-c', ...]\n")
+        warnings.append(f"WARN: server '{name}' args do not start with ['-c', ...]")
 
 
-def _warn_inline_secrets(name: str, obj: Dict[str, Any]) -> None:
+def _warn_inline_secrets(name: str, obj: Dict[str, Any], warnings: List[str]) -> None:
     for k, v in obj["env"].items():
         if looks_like_secret(v):
-            sys.stderr.write(
-                f"WARN: server '{name}' env '{k}' looks like inline secret; prefer env vars\n"
+            warnings.append(
+                f"WARN: server '{name}' env '{k}' looks like inline secret; prefer env vars"
             )
 
 
-def validate_server(name: str, srv: Dict[str, Any]) -> None:
+def validate_server(name: str, srv: Dict[str, Any], warnings: List[str]) -> None:
     # Validate required keys present.
     _assert_required_keys(name, srv, ["command", "args", "env"])
     _assert_string_field(name, srv, "command")
     _assert_list_of_strings(name, srv, "args")
     _assert_env_map(name, srv, "env")
 
-    _warn_command_not_sh(name, srv)
-    _warn_args_not_prefix(name, srv)
-    _warn_inline_secrets(name, srv)
+    _warn_command_not_sh(name, srv, warnings)
+    _warn_args_not_prefix(name, srv, warnings)
+    _warn_inline_secrets(name, srv, warnings)
+
+
+def check_config(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Return {"ok": bool, "messages": [...]} with messages in report order.
+
+    Validation stops at the first structural error, after any warnings for
+    the servers before it.
+    """
+    messages: List[str] = []
+    try:
+        if "mcpServers" not in data or not isinstance(data["mcpServers"], dict):
+            raise McpConfigError("ERROR: top-level 'mcpServers' must be an object")
+        for name, srv in data["mcpServers"].items():
+            if not isinstance(srv, dict):
+                raise McpConfigError(f"ERROR: server '{name}' must be an object")
+            validate_server(name, srv, messages)
+    except McpConfigError as exc:
+        messages.append(str(exc))
+        return {"ok": False, "messages": messages}
+    return {"ok": True, "messages": messages}
 
 
 def main() -> int:
-    data = load_json(MCP_PATH)
-    if "mcpServers" not in data or not isinstance(data["mcpServers"], dict):
-        sys.stderr.write("ERROR: top-level 'mcpServers' must be an object\n")
+    cache = ValidationCache.open("mcp-config", ruleset_digest(Path(__file__).resolve()))
+    name, key = cache_name(MCP_PATH), cache.key(MCP_PATH)
+    result = cache.lookup(name, key)
+    if result is None:
+        result = check_config(load_json(MCP_PATH))
+        cache.store(name, key, result)
+        cache.save()
+    for message in result["messages"]:
+        sys.stderr.write(f"{message}\n")
+    if not result["ok"]:
         return 1
-    for name, srv in data["mcpServers"].items():
-        if not isinstance(srv, dict):
-            sys.stderr.write(f"ERROR: server '{name}' must be an object\n")
-            return 1
-        validate_server(name, srv)
     print("MCP config looks structurally valid.")
     return 0
 
@@ -25,11 +25,23 @@ import os
 import shutil
 import subprocess
 import sys
-import zipfile
 from pathlib import Path
 from typing import Dict, List, Tuple
 
 ROOT = Path(__file__).resolve().parents[2]
+# Shared streaming ZIP writer (parallel member compression).
+sys.path.insert(0, str(ROOT / "agent-ecosystems" / "scripts"))
+from bundle_archive import (  # noqa: E402
+    CompressedMember,
+    ZipStreamWriter,
+    compress_file,
+    directory_member,
+    imap_ordered,
+    normalize_member,
+    source_date_time,
+    validate_method,
+)
+
 VSCODE = ROOT / "vscode"
 EXPORTS = VSCODE / "exports"
 WORKSPACES = EXPORTS / "workspaces"
@@ -46,7 +58,39 @@ def parse_args() -> argparse.Namespace:
     ap.add_argument(
         "slugs", nargs="*", help="Profile slugs to bundle; default: all from CONTROL.md"
     )
-    return ap.parse_args()
+    ap.add_argument(
+        "--compress-threads",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Threads compressing ZIP members (default: 1)",
+    )
+    ap.add_argument(
+        "--compression",
+        default="deflate",
+        metavar="METHOD",
+        help="ZIP member compression: stored, deflate[-1..9], bzip2[-1..9], lzma "
+        "or auto (benchmark per file; default: deflate)",
+    )
+    ap.add_argument(
+        "--reproducible",
+        action="store_true",
+        help="Sorted members with SOURCE_DATE_EPOCH (or 1980-01-01) timestamps and "
+        "0644/0755 modes, so identical bundle contents give an identical ZIP",
+    )
+    args = ap.parse_args()
+    if args.reproducible:
+        try:
+            source_date_time()
+        except ValueError as exc:
+            ap.error(str(exc))
+    if args.compress_threads < 1:
+        ap.error("--compress-threads must be >= 1")
+    try:
+        validate_method(args.compression)
+    except ValueError as exc:
+        ap.error(str(exc))
+    return args
 
 
 def slugs_from_control() -> List[Tuple[str, str]]:
@@ -346,7 +390,21 @@ def build_bundle(slug: str, pack: str):
     print(f"[bundles] built {slug} -> {bundle_dir}")
 
 
-def zip_bundle(slug: str):
+def compress_entry(
+    path: Path, base: Path, method: str = "deflate"
+) -> Tuple[str, CompressedMember]:
+    arcname = path.relative_to(base).as_posix()
+    if path.is_dir():
+        return f"{arcname}/", directory_member(path)
+    return arcname, compress_file(path, method)
+
+
+def zip_bundle(
+    slug: str,
+    compress_threads: int = 1,
+    compression: str = "deflate",
+    reproducible: bool = False,
+):
     bundle_dir = BUNDLES / slug
     if not bundle_dir.exists():
         raise FileNotFoundError(f"bundle directory missing: {bundle_dir}")
@@ -354,11 +412,22 @@ def zip_bundle(slug: str):
     tmp_zip = zip_path.with_suffix(".zip.tmp")
     if tmp_zip.exists():
         tmp_zip.unlink()
-    with zipfile.ZipFile(tmp_zip, "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for path in bundle_dir.rglob("*"):
-            if path.name in {".DS_Store"}:
-                continue
-            zf.write(path, arcname=path.relative_to(bundle_dir.parent))
+    paths = [p for p in bundle_dir.rglob("*") if p.name not in {".DS_Store"}]
+    if reproducible:
+        paths.sort(key=lambda p: p.relative_to(bundle_dir).as_posix())
+        date_time = source_date_time()
+    # Members are deflated on `compress_threads` threads but appended in
+    # path order, so the archive is the same for any thread count.
+    with tmp_zip.open("wb") as fp, ZipStreamWriter(fp) as zf:
+        entries = imap_ordered(
+            lambda p: compress_entry(p, bundle_dir.parent, compression),
+            paths,
+            compress_threads,
+        )
+        for arcname, member in entries:
+            if reproducible:
+                member = normalize_member(member, date_time)
+            zf.add(arcname, member)
     tmp_zip.replace(zip_path)
     print(f"[bundles] zipped {slug} -> {zip_path}")
 
@@ -373,7 +442,7 @@ def main():
             print(f"[warn] slug {slug} not in CONTROL.md; skipping", file=sys.stderr)
             continue
         build_bundle(slug, pack)
-        zip_bundle(slug)
+        zip_bundle(slug, args.compress_threads, args.compression, args.reproducible)
 
 
 if __name__ == "__main__":
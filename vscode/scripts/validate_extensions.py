@@ -5,6 +5,10 @@
 - Reports duplicate extension IDs per file.
 - Warns if the Codex placeholder id is still present.
 - Prints a summary at the end.
+
+Per-file results are cached under dist/cache/validation (see
+agent-ecosystems/scripts/validation_cache.py); set NO_VALIDATION_CACHE=1 to
+recheck every file.
 """
 
 from __future__ import annotations
@@ -17,6 +21,9 @@ ROOT = Path(__file__).resolve().parents[1]
 PACKS_DIR = ROOT / "packs"
 CODEX_PLACEHOLDER = "your-org.codex-vscode"
 
+sys.path.insert(0, str(ROOT.parent / "agent-ecosystems" / "scripts"))
+from validation_cache import ValidationCache, cache_name, ruleset_digest  # noqa: E402
+
 
 def validate_extensions_file(path: Path) -> dict:
     ids, errors, warnings = _collect_extension_issues(path)
@@ -70,17 +77,32 @@ def main() -> int:
         return 1
 
     totals = {"files": 0, "ids": 0, "errors": 0, "warnings": 0}
+    cache = ValidationCache.open(
+        "vscode-extensions", ruleset_digest(Path(__file__).resolve())
+    )
 
     for path in all_txt_files:
         totals["files"] += 1
-        result = validate_extensions_file(path)
+        result = _validate_cached(path, cache)
         totals["ids"] += result["count"]
         _print_result(path, result, totals)
 
+    cache.prune(cache_name(path) for path in all_txt_files)
+    cache.save()
     _print_summary(totals)
     return 1 if totals["errors"] else 0
 
 
+def _validate_cached(path: Path, cache: ValidationCache) -> dict:
+    name, key = cache_name(path), cache.key(path)
+    cached = cache.lookup(name, key)
+    if cached is not None:
+        return {"path": path, **cached}
+    result = validate_extensions_file(path)
+    cache.store(name, key, {k: v for k, v in result.items() if k != "path"})
+    return result
+
+
 def _print_result(path: Path, result: dict, totals: dict) -> None:
     if result["errors"] or result["warnings"]:
         print(f"\n=== {path} ===")